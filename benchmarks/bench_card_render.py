@@ -0,0 +1,80 @@
+"""
+Tiempo de generar el HTML del grid de tarjetas: sin caché, en frío y en caliente.
+
+Uso, desde la raíz del repositorio:
+
+    python -m benchmarks.bench_card_render --cards 1000
+
+"Sin caché" llama a ticket_card_html para cada tarjeta limpiando el texto
+tarjeta a tarjeta; "precalculado" hace lo mismo con los textos que
+normalize_tickets ya dejó limpios y escapados en la descarga. "Frío" usa
+cached_card_html (con los textos precalculados) y la caché vacía, y
+"caliente" repite la pasada con la caché ya llena, como un rerun en el que
+no cambió ningún ticket. Solo mide la construcción del
+HTML; el envío al navegador no depende de la caché.
+"""
+
+import argparse
+import functools
+import json
+import logging
+import statistics
+import time
+
+logging.disable(logging.WARNING)
+
+import pandas as pd
+
+import streamlit_app
+from benchmarks.synthetic import generate_tickets
+
+
+def _tickets(count: int):
+    df = streamlit_app.normalize_tickets(pd.DataFrame(generate_tickets(count)))
+    return list(streamlit_app._card_rows(df))
+
+
+def _render(tickets, build) -> float:
+    started = time.perf_counter()
+    for ticket, text, issues in tickets:
+        build(ticket, text=text, issues=issues)
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--cards", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--json", help="Ruta donde guardar los resultados")
+    args = parser.parse_args()
+
+    tickets = _tickets(args.cards)
+    cache = streamlit_app.get_card_html_cache()
+    cached = functools.partial(streamlit_app.cached_card_html, cache=cache)
+    per_card = lambda ticket, text, issues: streamlit_app.ticket_card_html(ticket)
+    uncached, precomputed, cold, warm = [], [], [], []
+    for _ in range(args.repeat):
+        uncached.append(_render(tickets, per_card))
+        precomputed.append(_render(tickets, streamlit_app.ticket_card_html))
+        cache.clear()
+        cold.append(_render(tickets, cached))
+        warm.append(_render(tickets, cached))
+
+    results = {
+        "cards": args.cards,
+        "uncached_ms": round(statistics.median(uncached) * 1000, 2),
+        "precomputed_ms": round(statistics.median(precomputed) * 1000, 2),
+        "cold_ms": round(statistics.median(cold) * 1000, 2),
+        "warm_ms": round(statistics.median(warm) * 1000, 2),
+    }
+    print(f"{args.cards} tarjetas  sin caché: {results['uncached_ms']:.1f} ms  "
+          f"precalculado: {results['precomputed_ms']:.1f} ms  "
+          f"frío: {results['cold_ms']:.1f} ms  caliente: {results['warm_ms']:.1f} ms")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as fh:
+            json.dump(results, fh, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Tiempo hasta la primera pantalla del grid: todas las tarjetas frente a la ventana.
+
+Uso, desde la raíz del repositorio:
+
+    python -m benchmarks.bench_grid_window --sizes 100 1000 10000 100000
+
+Para cada tamaño de resultado genera el HTML del grid con todas las filas
+(como antes de paginar) y solo con la primera página (--page, 30 por
+defecto), siempre con la caché de tarjetas vacía. Con la ventana el tiempo
+debe mantenerse plano aunque crezca el resultado filtrado.
+"""
+
+import argparse
+import json
+import logging
+import statistics
+import time
+
+logging.disable(logging.WARNING)
+
+import pandas as pd
+
+import streamlit_app
+from benchmarks.synthetic import generate_tickets
+
+
+def _time_grid(df: pd.DataFrame, repeat: int) -> float:
+    cache = streamlit_app.get_card_html_cache()
+    timings = []
+    for _ in range(repeat):
+        cache.clear()
+        started = time.perf_counter()
+        streamlit_app.grid_html(df)
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000, 100000])
+    parser.add_argument("--page", type=int, default=streamlit_app.PAGE_SIZES[0])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--json", help="Ruta donde guardar los resultados")
+    args = parser.parse_args()
+
+    results = []
+    for size in args.sizes:
+        df = streamlit_app.normalize_tickets(pd.DataFrame(generate_tickets(size)))
+        full = _time_grid(df, args.repeat)
+        window = _time_grid(df.head(args.page), args.repeat)
+        results.append({
+            "rows": size,
+            "full_ms": round(full * 1000, 2),
+            "window_ms": round(window * 1000, 2),
+        })
+        print(f"{size:>7} tickets  todas: {full * 1000:9.1f} ms  "
+              f"ventana de {args.page}: {window * 1000:6.2f} ms")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as fh:
+            json.dump({"page": args.page, "results": results}, fh, indent=2)
+
+
+if __name__ == "__main__":
+    main()
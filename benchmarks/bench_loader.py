@@ -0,0 +1,91 @@
+"""
+Carga de un rerun (salud, métricas y tickets) en serie frente a concurrente.
+
+Uso, desde la raíz del repositorio:
+
+    python -m benchmarks.bench_loader --rows 5000 --latency 0.08
+
+Usa el servidor local de benchmarks/standin.py con un retardo fijo por
+respuesta (--latency, en segundos) para simular la distancia a Supabase.
+Cada ronda parte de cachés vacías, como el primer rerun de una sesión.
+"""
+
+import argparse
+import json
+import logging
+import statistics
+import time
+
+logging.disable(logging.WARNING)
+
+from supabase import create_client
+
+import streamlit_app
+from benchmarks.standin import StandInStore, serve
+from benchmarks.synthetic import generate_tickets
+
+
+def _tasks(service, search):
+    return {
+        "health": service.test_connection,
+        "metrics": lambda: service.fetch_metrics(search),
+        "global_metrics": lambda: service.fetch_metrics(),
+        "tickets": lambda: service.fetch_tickets(None, None, search),
+    }
+
+
+def _reset(service):
+    service.clear_cache()
+    streamlit_app.get_health_monitor.clear()
+
+
+def _sequential(service, search) -> float:
+    started = time.perf_counter()
+    for task in _tasks(service, search).values():
+        task()
+    return time.perf_counter() - started
+
+
+def _concurrent(service, search) -> float:
+    result = streamlit_app.get_loader().load(_tasks(service, search),
+                                             deadlines=streamlit_app.LOAD_DEADLINES)
+    return result.wall
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--latency", type=float, default=0.08)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--search", default="factura")
+    parser.add_argument("--json", help="Ruta donde guardar los resultados")
+    args = parser.parse_args()
+
+    store = StandInStore()
+    store.tables["opportunities"] = generate_tickets(args.rows)
+    store.latency = args.latency
+    server = serve(store)
+
+    service = streamlit_app.SupabaseService()
+    service._repository = streamlit_app.create_postgrest_repository(
+        create_client(server.url, "bench.standin.key"))
+
+    results = {}
+    for name, strategy in (("sequential", _sequential), ("concurrent", _concurrent)):
+        timings = []
+        for _ in range(args.repeat):
+            _reset(service)
+            timings.append(strategy(service, args.search))
+        results[name] = round(statistics.median(timings) * 1000, 1)
+
+    saved = results["sequential"] - results["concurrent"]
+    print(f"latencia {args.latency * 1000:.0f} ms  en serie: {results['sequential']:.1f} ms  "
+          f"concurrente: {results['concurrent']:.1f} ms  ahorro: {saved:.1f} ms")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as fh:
+            json.dump({"rows": args.rows, "latency": args.latency, "median_ms": results}, fh, indent=2)
+
+
+if __name__ == "__main__":
+    main()
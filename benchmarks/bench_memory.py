@@ -0,0 +1,107 @@
+"""
+Bytes por ticket de la representación anterior frente a la compacta.
+
+Uso, desde la raíz del repositorio:
+
+    python -m benchmarks.bench_memory --rows 100000 --rows 1000000
+
+"Antes" es lo que mantenía cada sesión: el DataFrame de object tal cual llega
+de Supabase más un Ticket (dataclass sin __slots__) por fila. "Después" es el
+DataFrame de normalize_tickets (categorías, datetime64, texto Arrow) más las
+vistas Ticket de una página visible. Se mide con tracemalloc más los bytes
+reservados por el pool de memoria de Arrow, que tracemalloc no ve.
+"""
+
+import argparse
+import gc
+import json
+import logging
+import tracemalloc
+from dataclasses import dataclass
+from typing import Optional
+
+logging.disable(logging.WARNING)
+
+import pandas as pd
+
+import streamlit_app
+from benchmarks.synthetic import generate_tickets
+
+VISIBLE_CARDS = 30
+
+
+@dataclass
+class LegacyTicket:
+    id: int
+    ticket_number: str
+    title: str
+    description: str
+    status: str
+    priority: str
+    notes: str
+    created_at: Optional[str] = None
+
+
+def _arrow_bytes() -> int:
+    try:
+        import pyarrow
+    except ImportError:
+        return 0
+    return pyarrow.total_allocated_bytes()
+
+
+def _traced(build) -> int:
+    """Bytes que siguen vivos tras ejecutar build()"""
+    gc.collect()
+    arrow_before = _arrow_bytes()
+    tracemalloc.start()
+    result = build()
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    current += _arrow_bytes() - arrow_before
+    del result
+    return current
+
+
+def _before(rows):
+    df = pd.DataFrame(rows).astype(object)
+    tickets = [
+        LegacyTicket(**{f: r[f] for f in streamlit_app.TICKET_FIELDS})
+        for r in df.to_dict("records")
+    ]
+    return df, tickets
+
+
+def _after(rows):
+    df = streamlit_app.normalize_tickets(pd.DataFrame(rows))
+    visible = df[streamlit_app.TICKET_FIELDS].head(VISIBLE_CARDS).itertuples(index=False, name=None)
+    return df, [streamlit_app.Ticket.from_row(values) for values in visible]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, action="append")
+    parser.add_argument("--json", help="Ruta donde guardar los resultados")
+    args = parser.parse_args()
+
+    results = []
+    for count in args.rows or [100000, 1000000]:
+        rows = generate_tickets(count)
+        before = _traced(lambda: _before(rows))
+        after = _traced(lambda: _after(rows))
+        results.append({
+            "rows": count,
+            "before_bytes_per_ticket": round(before / count, 1),
+            "after_bytes_per_ticket": round(after / count, 1),
+        })
+        print(f"{count:>9} filas  antes: {before / count:8.1f} B/ticket  "
+              f"después: {after / count:8.1f} B/ticket  ({before / max(after, 1):.1f}x)")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as fh:
+            json.dump(results, fh, indent=2)
+
+
+if __name__ == "__main__":
+    main()
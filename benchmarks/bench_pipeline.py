@@ -0,0 +1,171 @@
+"""
+Suite del recorrido completo (descarga → normalización → métricas → búsqueda → grid)
+a distintos tamaños de opportunities.
+
+Uso, desde la raíz del repositorio:
+
+    python -m benchmarks.bench_pipeline
+    python -m benchmarks.bench_pipeline --sizes 1000 10000 --compare benchmarks/results/pipeline-<commit>.json
+
+Para cada tamaño genera tickets sintéticos (benchmarks/synthetic.py, con
+títulos sin [IA], descripciones con caracteres repetidos y notas de
+relleno) y mide la mediana de cada etapa:
+
+    fetch            SupabaseService.fetch_tickets contra el servidor local, caché vacía
+    from_dict        Ticket.from_dict fila a fila (la validación original)
+    normalize        normalize_tickets sobre el DataFrame crudo (validación,
+                     limpieza de texto y cuarentena vectorizadas)
+    metrics          TicketMetrics.from_frame + render_metrics
+    search_scan      scan_frame: búsqueda lineal sobre las columnas de texto
+    search_index     construir TicketSearchIndex
+    search_query     consulta sobre el índice ya construido
+    grid_window      render_tickets_grid de la primera página, caché de tarjetas vacía
+    grid_full        grid_html de todas las filas (solo hasta --full-grid-max)
+
+Los resultados se guardan en JSON junto con el commit, para comparar dos
+ejecuciones con --compare (×N: la etapa es N veces más rápida que antes).
+La descarga de 1M filas del servidor local tarda varios minutos por
+repetición; --sizes permite acotar la ejecución.
+"""
+
+import argparse
+import json
+import logging
+import platform
+import statistics
+import subprocess
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+logging.disable(logging.WARNING)
+
+import pandas as pd
+from supabase import create_client
+
+import streamlit_app
+from benchmarks.standin import StandInStore, serve
+from benchmarks.synthetic import generate_tickets
+from search_index import TicketSearchIndex, scan_frame
+
+ROOT = Path(__file__).resolve().parent.parent
+RESULTS_DIR = ROOT / "benchmarks" / "results"
+DEFAULT_SIZES = [1000, 10000, 100000, 1000000]
+
+
+def _git(*args: str) -> Optional[str]:
+    try:
+        return subprocess.run(["git", *args], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _median_ms(task: Callable[[], object], repeat: int,
+               setup: Optional[Callable[[], None]] = None) -> float:
+    timings = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        started = time.perf_counter()
+        task()
+        timings.append(time.perf_counter() - started)
+    return round(statistics.median(timings) * 1000, 3)
+
+
+def _run_size(service, store: StandInStore, size: int, repeat: int,
+              query: str, full_grid_max: int) -> Dict[str, object]:
+    rows = generate_tickets(size)
+    store.tables["opportunities"] = rows
+    raw = pd.DataFrame(rows)
+    df = streamlit_app.normalize_tickets(raw)
+    card_cache = streamlit_app.get_card_html_cache()
+    page = df.head(streamlit_app.PAGE_SIZES[0])
+    index = TicketSearchIndex(df)
+
+    timings = {
+        "fetch": _median_ms(service.fetch_tickets, repeat, setup=service.clear_cache),
+        "from_dict": _median_ms(lambda: [streamlit_app.Ticket.from_dict(r) for r in rows], repeat),
+        "normalize": _median_ms(lambda: streamlit_app.normalize_tickets(raw), repeat),
+        "metrics": _median_ms(
+            lambda: streamlit_app.render_metrics(streamlit_app.TicketMetrics.from_frame(df)), repeat),
+        "search_scan": _median_ms(lambda: scan_frame(df, query), repeat),
+        "search_index": _median_ms(lambda: TicketSearchIndex(df), repeat),
+        "search_query": _median_ms(lambda: index.search(query), repeat),
+        "grid_window": _median_ms(lambda: streamlit_app.render_tickets_grid(page), repeat,
+                                  setup=card_cache.clear),
+        "grid_full": (_median_ms(lambda: streamlit_app.grid_html(df), repeat, setup=card_cache.clear)
+                      if size <= full_grid_max else None),
+    }
+    return {
+        "rows": size,
+        "malformed": int(df["is_malformed"].sum()),
+        "matches": len(scan_frame(df, query)),
+        "median_ms": timings,
+    }
+
+
+def _print_size(result: dict, baseline: Optional[dict]):
+    print(f"\n{result['rows']:,} tickets ({result['malformed']:,} malformados, "
+          f"{result['matches']:,} coincidencias)")
+    previous = (baseline or {}).get("median_ms", {})
+    for stage, ms in result["median_ms"].items():
+        if ms is None:
+            print(f"  {stage:<14} {'—':>11}")
+            continue
+        line = f"  {stage:<14} {ms:>9.1f} ms"
+        before = previous.get(stage)
+        if before:
+            line += f"   antes {before:>9.1f} ms  ×{before / ms if ms else float('inf'):.2f}"
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--query", default="factura")
+    parser.add_argument("--full-grid-max", type=int, default=100000,
+                        help="Tamaño máximo para medir grid_full")
+    parser.add_argument("--json", help="Ruta de resultados (por defecto benchmarks/results/)")
+    parser.add_argument("--compare", help="JSON de una ejecución anterior")
+    args = parser.parse_args()
+
+    baseline = {}
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as fh:
+            baseline = {r["rows"]: r for r in json.load(fh)["results"]}
+
+    store = StandInStore()
+    server = serve(store)
+    service = streamlit_app.SupabaseService()
+    service._repository = streamlit_app.create_postgrest_repository(
+        create_client(server.url, "bench.standin.key"))
+
+    commit = _git("rev-parse", "--short", "HEAD")
+    report = {
+        "benchmark": "pipeline",
+        "commit": commit,
+        "dirty": bool(_git("status", "--porcelain", "--untracked-files=no")),
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "repeat": args.repeat,
+        "query": args.query,
+        "results": [],
+    }
+    for size in args.sizes:
+        result = _run_size(service, store, size, args.repeat, args.query, args.full_grid_max)
+        report["results"].append(result)
+        _print_size(result, baseline.get(size))
+
+    path = Path(args.json) if args.json else RESULTS_DIR / f"pipeline-{commit or 'local'}.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as fh:
+        json.dump(report, fh, indent=2)
+    print(f"\nResultados en {path}")
+
+
+if __name__ == "__main__":
+    main()
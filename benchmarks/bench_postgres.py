@@ -0,0 +1,150 @@
+"""
+Compara el repositorio HTTP (PostgREST, JSON) con el de Postgres directo
+(COPY binario, cursores de servidor) sobre los mismos tickets.
+
+Uso, desde la raíz del repositorio:
+
+    python -m benchmarks.bench_postgres --dsn postgresql://localhost/tickets --load --rows 100000
+    python -m benchmarks.bench_postgres --dsn <cadena de Supabase> --url https://<proyecto>.supabase.co --key <key>
+
+--load crea la tabla con sql/local_schema.sql y sql/delta_sync.sql, la vacía
+y la rellena con tickets sintéticos: úsalo solo contra una base de pruebas.
+Sin --url el lado HTTP es el servidor local de benchmarks/standin.py con las
+mismas filas (un servidor en Python, así que solo orienta); con --url mide
+contra el PostgREST de la misma base. Para cada repositorio mide la mediana
+de:
+
+    fetch        fetch_tickets de toda la tabla (filas crudas)
+    normalize    fetch + normalize_tickets, lo que hace la app al descargar
+    first_page   fetch_page de la primera página (DEFAULT_PAGE_SIZE filas)
+    stream       iter_pages de toda la tabla por bloques
+    search       fetch_tickets con --query
+    metrics      fetch_metrics (recuentos status × priority)
+    update       update_ticket de una fila con sus valores actuales (--writes)
+"""
+
+import argparse
+import json
+import logging
+import statistics
+import time
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+logging.disable(logging.WARNING)
+
+import psycopg
+from supabase import create_client
+
+import streamlit_app
+from benchmarks.standin import StandInStore, serve
+from benchmarks.synthetic import generate_tickets
+from postgres_repository import PostgresConfig, PostgresRepository
+
+ROOT = Path(__file__).resolve().parent.parent
+LOAD_COLUMNS = ["id", "ticket_number", "title", "description", "status",
+                "priority", "notes", "created_at", "updated_at"]
+
+
+def load_postgres(dsn: str, rows: list):
+    """Crea la tabla si falta y la rellena con rows mediante COPY"""
+    with psycopg.connect(dsn) as conn:
+        for script in ("local_schema.sql", "delta_sync.sql"):
+            conn.execute((ROOT / "sql" / script).read_text(encoding="utf-8"))
+        conn.execute("TRUNCATE opportunities, opportunities_tombstones")
+        # Sin el trigger, updated_at conserva el valor sintético
+        conn.execute("ALTER TABLE opportunities DISABLE TRIGGER opportunities_touch_updated_at")
+        with conn.cursor().copy(
+            f"COPY opportunities ({', '.join(LOAD_COLUMNS)}) FROM STDIN"
+        ) as copy:
+            for row in rows:
+                copy.write_row([row.get(c) for c in LOAD_COLUMNS])
+        conn.execute("ALTER TABLE opportunities ENABLE TRIGGER opportunities_touch_updated_at")
+        conn.execute("ANALYZE opportunities")
+
+
+def _median_ms(task: Callable[[], object], repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        task()
+        timings.append(time.perf_counter() - started)
+    return round(statistics.median(timings) * 1000, 2)
+
+
+def _measure(repository, repeat: int, query: str, writes: bool) -> Dict[str, Optional[float]]:
+    columns = streamlit_app.TICKET_COLUMNS
+    page_size = streamlit_app.DEFAULT_PAGE_SIZE
+
+    def fetch():
+        return repository.fetch_tickets(None, None, None, page_size, columns)
+
+    def stream():
+        for _ in repository.iter_pages(None, None, None, page_size, columns):
+            pass
+
+    first = repository.fetch_page(None, None, None, None, 1, columns)[0]
+    ticket_id = int(first["id"].iloc[0]) if not first.empty else None
+    current = {c: first[c].iloc[0] for c in ("status", "notes")} if ticket_id is not None else {}
+
+    return {
+        "fetch": _median_ms(fetch, repeat),
+        "normalize": _median_ms(lambda: streamlit_app.normalize_tickets(fetch()), repeat),
+        "first_page": _median_ms(
+            lambda: repository.fetch_page(None, None, None, None, page_size, columns), repeat),
+        "stream": _median_ms(stream, repeat),
+        "search": _median_ms(
+            lambda: repository.fetch_tickets(None, None, query, page_size, columns), repeat),
+        "metrics": _median_ms(lambda: repository.fetch_metrics(None), repeat),
+        "update": (_median_ms(lambda: repository.update_ticket(ticket_id, current), repeat)
+                   if writes and ticket_id is not None else None),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--dsn", required=True, help="Cadena de conexión de Postgres")
+    parser.add_argument("--url", help="PostgREST/Supabase de la misma base")
+    parser.add_argument("--key", default="bench.standin.key")
+    parser.add_argument("--load", action="store_true",
+                        help="Vacía y rellena opportunities con --rows tickets sintéticos")
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--query", default="factura")
+    parser.add_argument("--writes", action="store_true", help="Mide también update_ticket")
+    parser.add_argument("--json", help="Ruta donde guardar los resultados")
+    args = parser.parse_args()
+
+    rows = generate_tickets(args.rows)
+    if args.load:
+        load_postgres(args.dsn, rows)
+
+    url = args.url
+    if not url:
+        store = StandInStore()
+        store.tables["opportunities"] = rows
+        url = serve(store).url
+
+    repositories = {
+        "http": streamlit_app.create_postgrest_repository(create_client(url, args.key)),
+        "postgres": PostgresRepository(args.dsn, PostgresConfig()),
+    }
+    results = {name: _measure(repository, args.repeat, args.query, args.writes)
+               for name, repository in repositories.items()}
+    repositories["postgres"].close()
+
+    print(f"{'etapa':<12} {'http':>11} {'postgres':>11}")
+    for stage, http_ms in results["http"].items():
+        pg_ms = results["postgres"][stage]
+        if http_ms is None or pg_ms is None:
+            continue
+        ratio = f"×{http_ms / pg_ms:.1f}" if pg_ms else ""
+        print(f"{stage:<12} {http_ms:>8.1f} ms {pg_ms:>8.1f} ms  {ratio}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as fh:
+            json.dump({"rows": args.rows, "median_ms": results}, fh, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Consultas sobre la réplica SQLite (TICKETS_SYNC_MODE = "replica") frente al snapshot en memoria.
+
+Uso, desde la raíz del repositorio:
+
+    python -m benchmarks.bench_replica --sizes 10000 100000
+
+Para cada tamaño rellena una réplica en un directorio temporal y mide la
+mediana de:
+
+    load         replace_all con la tabla normalizada (descarga completa)
+    restore      select_all + normalize_tickets, el arranque sin red
+    filter       ids de un status (índice) frente a TicketSnapshot.select
+    search       ids por FTS5 frente a scan_frame sobre el snapshot
+"""
+
+import argparse
+import json
+import logging
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable
+
+logging.disable(logging.WARNING)
+
+import pandas as pd
+
+import streamlit_app
+from benchmarks.synthetic import generate_tickets
+from replica import SqliteReplica
+from search_index import scan_frame
+from sync import TicketSnapshot
+
+
+def _median_ms(task: Callable[[], object], repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        task()
+        timings.append(time.perf_counter() - started)
+    return round(statistics.median(timings) * 1000, 2)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--query", default="factura")
+    parser.add_argument("--json", help="Ruta donde guardar los resultados")
+    args = parser.parse_args()
+
+    results = []
+    for size in args.sizes:
+        df = streamlit_app.normalize_tickets(pd.DataFrame(generate_tickets(size)))
+        snapshot = TicketSnapshot()
+        snapshot.load(df)
+        with tempfile.TemporaryDirectory() as tmp:
+            replica = SqliteReplica(Path(tmp) / "replica.sqlite3")
+            row = {
+                "rows": size,
+                "load_ms": _median_ms(lambda: replica.replace_all(df), 1),
+                "restore_ms": _median_ms(
+                    lambda: streamlit_app.normalize_tickets(replica.select_all()), args.repeat),
+                "filter_ms": _median_ms(lambda: replica.ids("new"), args.repeat),
+                "filter_memory_ms": _median_ms(lambda: snapshot.select("new"), args.repeat),
+                "search_ms": _median_ms(lambda: replica.ids(search_query=args.query), args.repeat),
+                "search_memory_ms": _median_ms(
+                    lambda: scan_frame(snapshot.frame, args.query), args.repeat),
+            }
+        results.append(row)
+        print(f"{size:>7} tickets  carga: {row['load_ms']:8.1f} ms  arranque: {row['restore_ms']:8.1f} ms")
+        print(f"{'':>16}filtro: {row['filter_ms']:7.2f} ms (memoria {row['filter_memory_ms']:.2f} ms)  "
+              f"búsqueda: {row['search_ms']:7.2f} ms (scan {row['search_memory_ms']:.2f} ms)")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as fh:
+            json.dump(results, fh, indent=2)
+
+
+if __name__ == "__main__":
+    main()
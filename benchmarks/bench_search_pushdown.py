@@ -0,0 +1,112 @@
+"""
+Compara la búsqueda en cliente (descargar todo y filtrar con pandas) con la
+búsqueda empujada al servidor (ilike en PostgREST).
+
+Uso, desde la raíz del repositorio:
+
+    python -m benchmarks.bench_search_pushdown --rows 50000
+    python -m benchmarks.bench_search_pushdown --url http://localhost:3000 --key <jwt>
+
+Sin --url arranca el servidor local de benchmarks/standin.py con tickets
+sintéticos; con --url mide contra un PostgREST/Supabase real ya poblado.
+"""
+
+import argparse
+import json
+import logging
+import statistics
+import time
+
+logging.disable(logging.WARNING)
+
+from supabase import create_client
+
+import streamlit_app
+from benchmarks.standin import StandInStore, serve
+from benchmarks.synthetic import generate_tickets
+
+DEFAULT_QUERIES = ["TKT-000123", "factura", "renovación"]
+
+
+class ByteCounter:
+    """Hook de httpx que suma los bytes de cada respuesta"""
+
+    def __init__(self):
+        self.total = 0
+
+    def __call__(self, response):
+        response.read()
+        self.total += len(response.content)
+
+
+def _client_side(service, query: str):
+    df = service.fetch_tickets()
+    if df.empty:
+        return df
+    query = query.lower()
+    return df[
+        df["title"].str.lower().str.contains(query, na=False, regex=False) |
+        df["ticket_number"].str.lower().str.contains(query, na=False, regex=False)
+    ]
+
+
+def _server_side(service, query: str):
+    return service.fetch_tickets(search_query=query)
+
+
+def _measure(service, counter: ByteCounter, strategy, query: str, repeat: int) -> dict:
+    timings, transferred, rows = [], 0, 0
+    for _ in range(repeat):
+        service.clear_cache()
+        counter.total = 0
+        started = time.perf_counter()
+        result = strategy(service, query)
+        timings.append(time.perf_counter() - started)
+        transferred, rows = counter.total, len(result)
+    return {
+        "rows": rows,
+        "bytes": transferred,
+        "median_ms": round(statistics.median(timings) * 1000, 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--url", help="PostgREST/Supabase existente")
+    parser.add_argument("--key", default="bench.standin.key")
+    parser.add_argument("--query", action="append", dest="queries")
+    parser.add_argument("--json", help="Ruta donde guardar los resultados")
+    args = parser.parse_args()
+
+    url = args.url
+    if not url:
+        store = StandInStore()
+        store.tables["opportunities"] = generate_tickets(args.rows)
+        url = serve(store).url
+
+    client = create_client(url, args.key)
+    counter = ByteCounter()
+    client.postgrest.session.event_hooks["response"].append(counter)
+    service = streamlit_app.SupabaseService()
+    service._repository = streamlit_app.create_postgrest_repository(client)
+
+    results = []
+    for query in args.queries or DEFAULT_QUERIES:
+        client_side = _measure(service, counter, _client_side, query, args.repeat)
+        server_side = _measure(service, counter, _server_side, query, args.repeat)
+        results.append({"query": query, "client": client_side, "server": server_side})
+        print(
+            f"{query!r:16} filas={server_side['rows']:>6}  "
+            f"cliente: {client_side['bytes'] / 1024:>9.1f} KB {client_side['median_ms']:>8.1f} ms  "
+            f"servidor: {server_side['bytes'] / 1024:>8.1f} KB {server_side['median_ms']:>8.1f} ms"
+        )
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as fh:
+            json.dump({"rows": args.rows, "results": results}, fh, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Arranque en frío: importación de la app, primer rerun y reruns en caliente.
+
+Uso, desde la raíz del repositorio:
+
+    python -m benchmarks.bench_startup --rows 2000 --repeat 3
+
+Cada ronda corre en un proceso nuevo (--probe) para que no quede nada en
+sys.modules ni en st.cache_resource. Mide lo que tarda importar
+streamlit_app con sus dependencias, el primer rerun completo con AppTest
+contra el servidor local de benchmarks/standin.py (cachés vacías, como la
+primera sesión tras desplegar) y la mediana de --reruns reruns siguientes.
+"""
+
+import argparse
+import json
+import logging
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+logging.disable(logging.WARNING)
+
+ROOT = Path(__file__).resolve().parent.parent
+APP_PATH = ROOT / "streamlit_app.py"
+
+
+def _probe(rows: int, reruns: int) -> dict:
+    started = time.perf_counter()
+    import streamlit_app  # noqa: F401
+    import_s = time.perf_counter() - started
+
+    from streamlit.testing.v1 import AppTest
+    from benchmarks.standin import StandInStore, serve
+    from benchmarks.synthetic import generate_tickets
+
+    store = StandInStore()
+    store.tables["opportunities"] = generate_tickets(rows)
+    server = serve(store)
+
+    at = AppTest.from_file(str(APP_PATH), default_timeout=120)
+    at.secrets["SUPABASE_URL"] = server.url
+    at.secrets["SUPABASE_KEY"] = "bench.standin.key"
+    started = time.perf_counter()
+    at.run()
+    first_s = time.perf_counter() - started
+
+    warm = []
+    for _ in range(reruns):
+        started = time.perf_counter()
+        at.run()
+        warm.append(time.perf_counter() - started)
+    if at.exception:
+        raise RuntimeError(at.exception[0].value)
+
+    return {
+        "import_ms": round(import_s * 1000, 1),
+        "first_run_ms": round(first_s * 1000, 1),
+        "rerun_ms": round(statistics.median(warm) * 1000, 1),
+    }
+
+
+def _run_probe(rows: int, reruns: int) -> dict:
+    output = subprocess.run(
+        [sys.executable, "-m", "benchmarks.bench_startup", "--probe",
+         "--rows", str(rows), "--reruns", str(reruns)],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--reruns", type=int, default=5)
+    parser.add_argument("--probe", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--json", help="Ruta donde guardar los resultados")
+    args = parser.parse_args()
+
+    if args.probe:
+        print(json.dumps(_probe(args.rows, args.reruns)))
+        return
+
+    rounds = [_run_probe(args.rows, args.reruns) for _ in range(args.repeat)]
+    results = {name: statistics.median(r[name] for r in rounds) for name in rounds[0]}
+    print(f"{args.rows} tickets  importación: {results['import_ms']:.0f} ms  "
+          f"primer rerun: {results['first_run_ms']:.0f} ms  "
+          f"rerun en caliente: {results['rerun_ms']:.0f} ms")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as fh:
+            json.dump({"rows": args.rows, "median": results, "rounds": rounds}, fh, indent=2)
+
+
+if __name__ == "__main__":
+    main()
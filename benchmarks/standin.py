@@ -0,0 +1,405 @@
+"""
+Servidor local que imita el subconjunto de PostgREST que usa la app.
+
+Sirve /rest/v1/<tabla> con select, filtros (eq, lt, ilike, is, in, or/and
+anidados), order, limit/offset, Prefer: count=exact, PATCH, upsert por POST y
+funciones registradas en /rest/v1/rpc/<nombre>. Cuenta peticiones y bytes
+enviados para comparar estrategias de consulta sin un Supabase real;
+store.latency añade un retardo fijo a cada respuesta para simular la red y
+store.max_rows recorta cada respuesta como db-max-rows de PostgREST.
+
+Como haría un índice en Postgres, cada orden se calcula una vez por versión
+de la tabla y la paginación por cursor (keyset) salta directamente a la
+primera fila posible, así que descargar N filas en páginas no cuesta N²/página.
+"""
+
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+from urllib.parse import parse_qsl, urlsplit
+
+RESERVED_PARAMS = {"select", "order", "limit", "offset", "on_conflict", "columns"}
+# Filtro de cursor de repository.PostgrestRepository.fetch_page: c.lt.X,and(c.eq.X,k.lt.N),c.is.null
+KEYSET_FILTER = re.compile(r"\((\w+)\.lt\.(.+),and\(\1\.eq\.\2,(\w+)\.lt\.([^,()]+)\),\1\.is\.null\)$")
+
+
+def _split_top_level(text: str) -> List[str]:
+    """Separa por comas respetando paréntesis y comillas"""
+    parts, depth, quoted, current = [], 0, False, []
+    i = 0
+    while i < len(text):
+        char = text[i]
+        if char == "\\" and quoted and i + 1 < len(text):
+            current.append(text[i:i + 2])
+            i += 2
+            continue
+        if char == '"':
+            quoted = not quoted
+        elif not quoted and char == "(":
+            depth += 1
+        elif not quoted and char == ")":
+            depth -= 1
+        elif not quoted and depth == 0 and char == ",":
+            parts.append("".join(current))
+            current = []
+            i += 1
+            continue
+        current.append(char)
+        i += 1
+    if current:
+        parts.append("".join(current))
+    return parts
+
+
+def _unquote(value: str) -> str:
+    if len(value) >= 2 and value[0] == '"' and value[-1] == '"':
+        return re.sub(r"\\(.)", r"\1", value[1:-1])
+    return value
+
+
+def _like_regex(pattern: str) -> "re.Pattern":
+    out, i = [], 0
+    while i < len(pattern):
+        char = pattern[i]
+        if char == "\\" and i + 1 < len(pattern):
+            out.append(re.escape(pattern[i + 1]))
+            i += 2
+            continue
+        if char in "*%":
+            out.append(".*")
+        elif char == "_":
+            out.append(".")
+        else:
+            out.append(re.escape(char))
+        i += 1
+    return re.compile("^" + "".join(out) + "$", re.IGNORECASE | re.DOTALL)
+
+
+def _coerce(current, raw: str):
+    if isinstance(current, bool):
+        return raw == "true"
+    if isinstance(current, int):
+        try:
+            return int(raw)
+        except ValueError:
+            return raw
+    if isinstance(current, float):
+        return float(raw)
+    return raw
+
+
+def _compare(row: dict, column: str, operator: str, raw: str) -> bool:
+    negate = False
+    if operator.startswith("not."):
+        negate, operator = True, operator[4:]
+    value = row.get(column)
+    if operator == "is":
+        result = value is None if raw == "null" else value == (raw == "true")
+    elif operator in ("like", "ilike"):
+        result = value is not None and bool(_like_regex(raw).match(str(value)))
+    elif operator == "in":
+        options = [_unquote(v) for v in _split_top_level(raw.strip("()"))]
+        result = value is not None and str(value) in options
+    elif value is None:
+        result = False
+    else:
+        target = _coerce(value, raw)
+        try:
+            result = {
+                "eq": value == target, "neq": value != target,
+                "lt": value < target, "lte": value <= target,
+                "gt": value > target, "gte": value >= target,
+            }[operator]
+        except (KeyError, TypeError):
+            result = False
+    return not result if negate else result
+
+
+def _parse_condition(text: str):
+    """Convierte 'col.op.valor' o 'and(...)'/'or(...)' en un predicado"""
+    for logic in ("and", "or", "not.and", "not.or"):
+        if text.startswith(logic + "("):
+            inner = [_parse_condition(p) for p in _split_top_level(text[len(logic) + 1:-1])]
+            combine = all if logic.endswith("and") else any
+            if logic.startswith("not."):
+                return lambda row: not combine(p(row) for p in inner)
+            return lambda row: combine(p(row) for p in inner)
+    column, operator, raw = text.split(".", 2)
+    if operator == "not":
+        operator, raw = raw.split(".", 1)
+        operator = "not." + operator
+    raw = _unquote(raw)
+    return lambda row: _compare(row, column, operator, raw)
+
+
+def _param_predicate(key: str, value: str):
+    if key in ("or", "and", "not.or", "not.and"):
+        return _parse_condition(f"{key}{value}")
+    operator, raw = value.split(".", 1)
+    if operator == "not":
+        operator, raw = raw.split(".", 1)
+        operator = "not." + operator
+    raw = _unquote(raw)
+    return lambda row: _compare(row, key, operator, raw)
+
+
+def _sort_key(value):
+    return (value is None, value)
+
+
+def _sort_rows(rows: List[dict], order: Optional[str]) -> List[dict]:
+    """Ordena según el parámetro order de PostgREST (col.desc.nullslast,...)"""
+    for spec in reversed((order or "").split(",")) if order else []:
+        column, *flags = spec.split(".")
+        desc = "desc" in flags
+        nulls_first = "nullsfirst" in flags or ("nullslast" not in flags and desc)
+        present = [r for r in rows if r.get(column) is not None]
+        missing = [r for r in rows if r.get(column) is None]
+        present.sort(key=lambda r: r[column], reverse=desc)
+        rows = missing + present if nulls_first else present + missing
+    return rows
+
+
+def _keyset_start(rows: List[dict], order: Optional[str], condition: Optional[str]) -> int:
+    """Primera posición que puede cumplir un filtro de cursor sobre filas ya ordenadas.
+
+    Solo para la forma que usa la app con order=c.desc.nullslast,k.desc: ahí
+    el filtro es falso para un prefijo y cierto para el resto, así que se
+    busca el corte por bisección. En cualquier otro caso devuelve 0.
+    """
+    match = KEYSET_FILTER.match(condition or "")
+    if not match or order != f"{match.group(1)}.desc.nullslast,{match.group(3)}.desc":
+        return 0
+    predicate = _param_predicate("or", condition)
+    low, high = 0, len(rows)
+    while low < high:
+        middle = (low + high) // 2
+        if predicate(rows[middle]):
+            high = middle
+        else:
+            low = middle + 1
+    return low
+
+
+def ticket_counts(rows: List[dict], params: dict) -> List[dict]:
+    """Equivalente a sql/ticket_metrics.sql (solo la búsqueda ilike)"""
+    search = (params.get("search") or "").lower()
+    counts: Dict[tuple, int] = {}
+    for row in rows:
+        if search and not any(search in str(row.get(f) or "").lower()
+                              for f in ("title", "ticket_number", "description", "notes")):
+            continue
+        status = str(row.get("status") or "").strip().lower()
+        if status not in ("new", "in_progress", "won", "closed"):
+            status = "new"
+        priority = str(row.get("priority") or "").strip()
+        if priority not in ("Low", "Medium", "High"):
+            priority = "Medium"
+        counts[(status, priority)] = counts.get((status, priority), 0) + 1
+    return [{"status": s, "priority": p, "total": n} for (s, p), n in counts.items()]
+
+
+def update_tickets(rows: List[dict], params: dict) -> List[dict]:
+    """Equivalente a sql/update_tickets.sql: modifica filas existentes, nunca inserta"""
+    by_id = {row.get("id"): row for row in rows}
+    updated = []
+    for change in params.get("rows") or []:
+        row = by_id.get(change.get("id"))
+        if row is None:
+            continue
+        row.update({k: v for k, v in change.items() if k in ("status", "priority", "notes")})
+        updated.append({"id": row["id"]})
+    return updated
+
+
+# Funciones que modifican filas: se ejecutan con el lock y cambian la versión
+WRITE_RPCS = {"update_tickets"}
+
+
+class StandInStore:
+    """Tablas en memoria protegidas por un lock.
+
+    Quien modifique filas en sitio (sin pasar por HTTP) debe llamar a
+    changed() para que no se sirvan órdenes cacheados con valores viejos.
+    """
+
+    def __init__(self):
+        self.tables: Dict[str, List[dict]] = {}
+        self.rpcs: Dict[str, callable] = {"ticket_counts": ticket_counts,
+                                          "update_tickets": update_tickets}
+        self.lock = threading.Lock()
+        self.bytes_sent = 0
+        self.requests = 0
+        self.latency = 0.0
+        # Como db-max-rows de PostgREST: tope de filas por respuesta (None = sin tope)
+        self.max_rows: Optional[int] = None
+        self.version = 0
+        self._sorted: Dict[tuple, tuple] = {}
+
+    def changed(self):
+        with self.lock:
+            self.version += 1
+
+    def ordered(self, table: str, order: Optional[str]) -> List[dict]:
+        """Filas de table en el orden pedido, cacheadas mientras la tabla no cambie"""
+        with self.lock:
+            rows = self.tables.get(table, [])
+            stamp = (id(rows), len(rows), self.version)
+            cached = self._sorted.get((table, order))
+            if cached is None or cached[0] != stamp:
+                cached = (stamp, _sort_rows(list(rows), order))
+                self._sorted[(table, order)] = cached
+            return cached[1]
+
+    def reset_counters(self):
+        with self.lock:
+            self.bytes_sent = 0
+            self.requests = 0
+
+
+class _Handler(BaseHTTPRequestHandler):
+    store: StandInStore = None
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def _table_and_params(self):
+        parts = urlsplit(self.path)
+        path = parts.path
+        if path.startswith("/rest/v1"):
+            path = path[len("/rest/v1"):]
+        return path.strip("/"), parse_qsl(parts.query, keep_blank_values=True)
+
+    def _body(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        return json.loads(self.rfile.read(length) or b"null") if length else None
+
+    def _send(self, status: int, payload, headers: Optional[dict] = None, head=False):
+        if self.store.latency:
+            time.sleep(self.store.latency)
+        body = json.dumps(payload, default=str).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(0 if head else len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        if not head:
+            self.wfile.write(body)
+        with self.store.lock:
+            self.store.requests += 1
+            self.store.bytes_sent += 0 if head else len(body)
+
+    def _filtered(self, rows, params):
+        predicates = [_param_predicate(k, v) for k, v in params if k not in RESERVED_PARAMS]
+        return [r for r in rows if all(p(r) for p in predicates)]
+
+    def _project(self, rows, params):
+        select = dict(params).get("select", "*")
+        if select in ("*", ""):
+            return [dict(r) for r in rows]
+        columns = [c.strip() for c in select.split(",")]
+        if columns == ["count"]:
+            return [{"count": len(rows)}]
+        return [{c: r.get(c) for c in columns} for r in rows]
+
+    def do_GET(self, head=False):
+        table, params = self._table_and_params()
+        query = dict(params)
+        rows = self.store.ordered(table, query.get("order"))
+        predicates = [_param_predicate(k, v) for k, v in params if k not in RESERVED_PARAMS]
+        offset = int(query.get("offset", 0))
+        limit = int(query["limit"]) if "limit" in query else None
+        if self.store.max_rows is not None:
+            limit = min(limit, self.store.max_rows) if limit is not None else self.store.max_rows
+        counting = "count=" in (self.headers.get("Prefer") or "")
+        
+        # Sin recuento basta con recorrer hasta completar la página
+        start = 0 if counting else _keyset_start(rows, query.get("order"), query.get("or"))
+        page, total = [], 0
+        for position in range(start, len(rows)):
+            row = rows[position]
+            if not all(p(row) for p in predicates):
+                continue
+            total += 1
+            if total > offset and (limit is None or len(page) < limit):
+                page.append(row)
+            elif not counting and limit is not None and len(page) >= limit:
+                break
+        rows = page
+        headers = {}
+        if counting:
+            end = offset + len(rows) - 1
+            headers["Content-Range"] = f"{offset}-{end}/{total}" if rows else f"*/{total}"
+        self._send(200, self._project(rows, params), headers, head=head)
+
+    def do_HEAD(self):
+        self.do_GET(head=True)
+
+    def do_PATCH(self):
+        table, params = self._table_and_params()
+        changes = self._body() or {}
+        with self.store.lock:
+            rows = self.store.tables.get(table, [])
+            matched = self._filtered(rows, params)
+            for row in matched:
+                row.update(changes)
+            result = [dict(r) for r in matched]
+            self.store.version += 1
+        self._send(200, result)
+
+    def do_POST(self):
+        table, params = self._table_and_params()
+        payload = self._body()
+        if table.startswith("rpc/"):
+            handler = self.store.rpcs.get(table[4:])
+            if handler is None:
+                return self._send(404, {"message": "function not found"})
+            if table[4:] in WRITE_RPCS:
+                with self.store.lock:
+                    result = handler(self.store.tables.get("opportunities", []), payload or {})
+                    self.store.version += 1
+                return self._send(200, result)
+            with self.store.lock:
+                rows = list(self.store.tables.get("opportunities", []))
+            return self._send(200, handler(rows, payload or {}))
+        items = payload if isinstance(payload, list) else [payload]
+        key = dict(params).get("on_conflict", "id")
+        result = []
+        with self.store.lock:
+            rows = self.store.tables.setdefault(table, [])
+            by_key = {r.get(key): r for r in rows}
+            for item in items:
+                existing = by_key.get(item.get(key))
+                if existing is not None:
+                    existing.update(item)
+                    result.append(dict(existing))
+                else:
+                    rows.append(dict(item))
+                    result.append(dict(item))
+            self.store.version += 1
+        self._send(201, result)
+
+    def do_DELETE(self):
+        table, params = self._table_and_params()
+        with self.store.lock:
+            rows = self.store.tables.get(table, [])
+            matched = self._filtered(rows, params)
+            ids = {id(r) for r in matched}
+            self.store.tables[table] = [r for r in rows if id(r) not in ids]
+            self.store.version += 1
+        self._send(200, [dict(r) for r in matched])
+
+
+def serve(store: StandInStore, host: str = "127.0.0.1", port: int = 0) -> ThreadingHTTPServer:
+    """Arranca el servidor en un hilo y devuelve la instancia (url en server.url)"""
+    handler = type("StandInHandler", (_Handler,), {"store": store})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    server.url = f"http://{host}:{server.server_address[1]}"
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
@@ -0,0 +1,66 @@
+"""
+Generador de tickets sintéticos con los defectos que la app debe tolerar
+"""
+
+import random
+from datetime import datetime, timedelta, timezone
+from typing import List
+
+SUBJECTS = [
+    "Cotización de licencias", "Error al iniciar sesión", "Renovación anual",
+    "Integración con ERP", "Demo para equipo comercial", "Factura duplicada",
+    "Migración de datos", "Ampliación de usuarios", "Consulta de precios",
+    "Soporte de API",
+]
+PEOPLE = ["Ana Torres", "Luis Gómez", "Marta Ruiz", "Jorge Díaz", "Lucía Vega", "Pablo Sanz"]
+DESCRIPTIONS = [
+    "El cliente solicita una propuesta para {n} usuarios con soporte prioritario.",
+    "Reporta que el acceso falla desde el {n} de este mes en varios navegadores.",
+    "Quiere conectar su sistema interno mediante la API pública antes del cierre.",
+    "Pide revisar la factura {n} porque aparece un cargo repetido.",
+]
+NOTES = ["Llamar el lunes para confirmar", "Enviada propuesta inicial", "Pendiente de aprobación interna"]
+PLACEHOLDER_NOTES = ["sad", "n/a", "none", "", None]
+STATUSES = ["new", "in_progress", "won", "closed"]
+PRIORITIES = ["Low", "Medium", "High"]
+
+
+def generate_tickets(count: int, seed: int = 42, malformed_ratio: float = 0.1) -> List[dict]:
+    """Filas con la forma de la tabla opportunities.
+
+    Una fracción malformed_ratio trae títulos sin [IA], descripciones con
+    caracteres repetidos o HTML, notas de relleno y enums mal escritos.
+    """
+    rnd = random.Random(seed)
+    start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    rows = []
+    for ticket_id in range(1, count + 1):
+        created = start + timedelta(seconds=rnd.randint(0, 400 * 86400))
+        subject = rnd.choice(SUBJECTS)
+        row = {
+            "id": ticket_id,
+            "ticket_number": f"TKT-{ticket_id:06d}",
+            "title": f"[IA] {subject} - {rnd.choice(PEOPLE)}",
+            "description": rnd.choice(DESCRIPTIONS).format(n=rnd.randint(2, 500)),
+            "status": rnd.choice(STATUSES),
+            "priority": rnd.choice(PRIORITIES),
+            "notes": rnd.choice(NOTES),
+            "created_at": created.isoformat(),
+            "updated_at": created.isoformat(),
+        }
+        if rnd.random() < malformed_ratio:
+            defect = rnd.randrange(6)
+            if defect == 0:
+                row["title"] = rnd.choice([subject, "x", "", None])
+            elif defect == 1:
+                row["description"] = rnd.choice(["aaaaaaaaaaaa", "<b>ok</b>''", '"', "zzzzzz!!"])
+            elif defect == 2:
+                row["notes"] = rnd.choice(PLACEHOLDER_NOTES)
+            elif defect == 3:
+                row["status"] = rnd.choice(["NEW ", "In_Progress", "", None, "archived"])
+            elif defect == 4:
+                row["priority"] = rnd.choice(["high", "", None, "Urgent"])
+            else:
+                row["ticket_number"] = None
+        rows.append(row)
+    return rows
@@ -0,0 +1,188 @@
+"""
+Suscripción a cambios de fila (INSERT/UPDATE/DELETE) aplicada al snapshot local
+"""
+
+import asyncio
+import logging
+import queue
+import threading
+import time
+from typing import Callable, Iterable, List, Optional
+
+import pandas as pd
+
+from sync import TicketSnapshot
+
+logger = logging.getLogger(__name__)
+
+BATCH_WINDOW_SECONDS = 0.1
+RETRY_DELAY_SECONDS = 5.0
+
+
+def normalize_event(payload: dict) -> Optional[dict]:
+    """Reduce un payload de Supabase Realtime a {type, record, old_record}.
+
+    Acepta tanto el payload completo ({"data": {...}, "ids": [...]}) como el
+    contenido de "data", y las variantes eventType/new/old del cliente JS.
+    """
+    data = payload.get("data", payload) if isinstance(payload, dict) else None
+    if not isinstance(data, dict):
+        return None
+    event_type = str(data.get("type") or data.get("eventType") or "").upper()
+    if event_type not in ("INSERT", "UPDATE", "DELETE"):
+        return None
+    return {
+        "type": event_type,
+        "record": data.get("record") or data.get("new") or {},
+        "old_record": data.get("old_record") or data.get("old") or {},
+    }
+
+
+class QueueChangeSource:
+    """Fuente de eventos a partir de una cola; sirve de sustituto en pruebas"""
+
+    def __init__(self, events: Optional["queue.Queue"] = None):
+        self.events = events if events is not None else queue.Queue()
+
+    def emit(self, event_type: str, record: Optional[dict] = None, old_record: Optional[dict] = None):
+        self.events.put({"type": event_type, "record": record or {}, "old_record": old_record or {}})
+
+    def run(self, emit: Callable[[dict], None], stop: threading.Event):
+        while not stop.is_set():
+            try:
+                emit(self.events.get(timeout=0.2))
+            except queue.Empty:
+                continue
+
+
+class SupabaseChangeSource:
+    """Canal postgres_changes de Supabase Realtime sobre una tabla"""
+
+    def __init__(self, url: str, key: str, table: str = "opportunities", schema: str = "public"):
+        self.url = url
+        self.key = key
+        self.table = table
+        self.schema = schema
+
+    def run(self, emit: Callable[[dict], None], stop: threading.Event):
+        asyncio.run(self._listen(emit, stop))
+
+    async def _listen(self, emit: Callable[[dict], None], stop: threading.Event):
+        from supabase import acreate_client
+
+        client = await acreate_client(self.url, self.key)
+        channel = client.channel(f"{self.table}-changes")
+        channel.on_postgres_changes("*", callback=emit, table=self.table, schema=self.schema)
+        await channel.subscribe()
+        try:
+            while not stop.is_set():
+                await asyncio.sleep(0.5)
+        finally:
+            await client.remove_channel(channel)
+
+
+class ChangeFeed:
+    """Listener único por proceso que mantiene el snapshot al día.
+
+    Un hilo escucha la fuente y encola eventos; otro los agrupa en ventanas
+    de BATCH_WINDOW_SECONDS y los aplica al snapshot con una sola fusión por
+    lote, de modo que una ráfaga de cambios no reordena la tabla por evento.
+    Cada lote aplicado incrementa snapshot.version y llama a on_change;
+    transform, si se indica, se aplica a las filas antes de fusionarlas.
+    """
+
+    def __init__(self, snapshot: TicketSnapshot, source, columns: Optional[Iterable[str]] = None,
+                 on_change: Optional[Callable[[], None]] = None,
+                 transform: Optional[Callable[[pd.DataFrame], pd.DataFrame]] = None):
+        self.snapshot = snapshot
+        self.source = source
+        self.columns: Optional[List[str]] = list(columns) if columns else None
+        self.on_change = on_change
+        self.transform = transform
+        self.connected = False
+        self.events_applied = 0
+        self.last_event_at: Optional[float] = None
+        self._events: "queue.Queue" = queue.Queue()
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+
+    @property
+    def version(self) -> int:
+        return self.snapshot.version
+
+    def start(self) -> "ChangeFeed":
+        if not self._threads:
+            for target, name in ((self._listen, "change-feed-listen"), (self._apply_loop, "change-feed-apply")):
+                thread = threading.Thread(target=target, name=name, daemon=True)
+                thread.start()
+                self._threads.append(thread)
+        return self
+
+    def stop(self):
+        self._stop.set()
+        for thread in self._threads:
+            thread.join(timeout=2)
+        self._threads = []
+
+    def _listen(self):
+        while not self._stop.is_set():
+            try:
+                self.connected = True
+                self.source.run(self._events.put, self._stop)
+            except Exception:
+                logger.exception("Change feed desconectado; reintentando")
+            finally:
+                self.connected = False
+            self._stop.wait(RETRY_DELAY_SECONDS)
+
+    def _apply_loop(self):
+        while not self._stop.is_set():
+            try:
+                batch = [self._events.get(timeout=0.2)]
+            except queue.Empty:
+                continue
+            deadline = time.monotonic() + BATCH_WINDOW_SECONDS
+            while time.monotonic() < deadline:
+                try:
+                    batch.append(self._events.get(timeout=max(deadline - time.monotonic(), 0)))
+                except queue.Empty:
+                    break
+            try:
+                self.apply(batch)
+            except Exception:
+                logger.exception("No se pudo aplicar un lote de cambios")
+
+    def apply(self, payloads: Iterable[dict]) -> int:
+        """Aplica eventos en orden; devuelve cuántas filas cambiaron"""
+        upserts: dict = {}
+        deleted: set = set()
+        for payload in payloads:
+            event = normalize_event(payload)
+            if event is None:
+                continue
+            if event["type"] == "DELETE":
+                ticket_id = event["old_record"].get("id")
+                if ticket_id is not None:
+                    upserts.pop(ticket_id, None)
+                    deleted.add(ticket_id)
+            else:
+                record = event["record"]
+                if record.get("id") is None:
+                    continue
+                if self.columns:
+                    record = {c: record.get(c) for c in self.columns}
+                deleted.discard(record["id"])
+                upserts[record["id"]] = record
+
+        changed = 0
+        if upserts:
+            rows = pd.DataFrame(list(upserts.values()))
+            changed += self.snapshot.merge(self.transform(rows) if self.transform else rows)
+        if deleted:
+            changed += self.snapshot.delete(deleted)
+        if changed:
+            self.events_applied += changed
+            self.last_event_at = time.time()
+            if self.on_change:
+                self.on_change()
+        return changed
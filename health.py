@@ -0,0 +1,153 @@
+"""
+Estado de la conexión con Supabase compartido por proceso: sondeo acotado,
+backoff exponencial y circuit breaker
+"""
+
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+PROBE_INTERVAL_SECONDS = 30.0
+BACKOFF_BASE_SECONDS = 2.0
+BACKOFF_MAX_SECONDS = 120.0
+FAILURE_THRESHOLD = 3
+
+
+class ServiceUnavailable(Exception):
+    """La petición no llegó a enviarse (circuito abierto o sin cliente)"""
+
+
+def is_network_error(error: Exception) -> bool:
+    """True si error es de transporte (conexión, timeout); los de datos o permisos no cuentan.
+
+    httpx y psycopg se importan al crear el cliente: si no están cargados, el
+    error no puede ser suyo. De psycopg solo cuenta OperationalError (conexión
+    perdida, statement_timeout y también psycopg_pool.PoolTimeout, que hereda
+    de ella); ProgrammingError, DataError o UndefinedTable son de esquema o datos.
+    """
+    if isinstance(error, ServiceUnavailable):
+        return False
+    network_errors = [OSError]
+    httpx = sys.modules.get("httpx")
+    if httpx is not None:
+        network_errors.append(httpx.TransportError)
+    psycopg = sys.modules.get("psycopg")
+    if psycopg is not None:
+        network_errors.append(psycopg.OperationalError)
+    return isinstance(error, tuple(network_errors))
+
+
+@dataclass(frozen=True)
+class HealthStatus:
+    ok: Optional[bool]
+    message: str
+    count: Optional[int] = None
+    circuit_open: bool = False
+    retry_in: float = 0.0
+
+
+class HealthMonitor:
+    """Recuerda el último resultado conocido en lugar de preguntar en cada rerun.
+
+    Las lecturas y escrituras normales informan con record_success /
+    record_failure, así que mientras hay tráfico no hace falta sondear. Tras
+    cada fallo el siguiente intento se aplaza el doble (hasta backoff_max);
+    con failure_threshold fallos seguidos el circuito se abre y
+    allow_request deja pasar una sola petición de prueba por periodo.
+    """
+
+    def __init__(self, probe_interval: float = PROBE_INTERVAL_SECONDS,
+                 backoff_base: float = BACKOFF_BASE_SECONDS,
+                 backoff_max: float = BACKOFF_MAX_SECONDS,
+                 failure_threshold: int = FAILURE_THRESHOLD,
+                 clock: Callable[[], float] = time.monotonic):
+        self.probe_interval = probe_interval
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.failure_threshold = failure_threshold
+        self._clock = clock
+        self._ok: Optional[bool] = None
+        self._message = "Sin comprobar"
+        self._count: Optional[int] = None
+        self._failures = 0
+        self._next_probe_at = 0.0
+        self._retry_at = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    @property
+    def circuit_open(self) -> bool:
+        return self._failures >= self.failure_threshold
+
+    def _backoff(self) -> float:
+        return min(self.backoff_base * 2 ** (self._failures - 1), self.backoff_max)
+
+    def allow_request(self) -> bool:
+        """False mientras el circuito está abierto; al vencer deja pasar una prueba"""
+        with self._lock:
+            if not self.circuit_open:
+                return True
+            now = self._clock()
+            if now < self._retry_at:
+                return False
+            # Las demás peticiones esperan al resultado de esta (o al siguiente periodo)
+            self._retry_at = now + self._backoff()
+            return True
+
+    def record_success(self, count: Optional[int] = None, message: str = "Conexión exitosa"):
+        with self._lock:
+            self._ok = True
+            self._message = message
+            self._failures = 0
+            self._retry_at = 0.0
+            self._next_probe_at = self._clock() + self.probe_interval
+            if count is not None:
+                self._count = count
+
+    def record_failure(self, error):
+        with self._lock:
+            self._ok = False
+            self._message = str(error) or type(error).__name__
+            self._failures += 1
+            delay = self._backoff()
+            self._next_probe_at = self._clock() + delay
+            if self.circuit_open:
+                self._retry_at = self._next_probe_at
+
+    def note_count(self, count: Optional[int]):
+        """Registra un recuento de filas conocido por otra vía (fetch o métricas)"""
+        if count is not None:
+            with self._lock:
+                self._count = count
+
+    def status(self) -> HealthStatus:
+        with self._lock:
+            retry_in = max(self._retry_at - self._clock(), 0.0) if self.circuit_open else 0.0
+            return HealthStatus(self._ok, self._message, self._count, self.circuit_open, retry_in)
+
+    def check(self, probe: Callable[[], Optional[int]]) -> HealthStatus:
+        """Ejecuta probe solo si toca; devuelve el estado (posiblemente cacheado).
+
+        probe devuelve el recuento de filas (o None) y lanza si falla. Un
+        solo hilo sondea a la vez; los demás reciben el último estado.
+        """
+        with self._lock:
+            due = not self._probing and self._clock() >= self._next_probe_at
+            if due:
+                self._probing = True
+        if not due:
+            return self.status()
+        try:
+            if self.allow_request():
+                try:
+                    count = probe()
+                except Exception as e:
+                    self.record_failure(e)
+                else:
+                    self.record_success(count)
+        finally:
+            with self._lock:
+                self._probing = False
+        return self.status()
@@ -0,0 +1,131 @@
+"""
+Carga concurrente de los datos de un rerun con plazos por petición
+"""
+
+import contextvars
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeout
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Hashable, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DEADLINE_SECONDS = 10.0
+
+
+@dataclass
+class LoadResult:
+    """Valores de cada tarea más su duración.
+
+    timings guarda lo que tardó cada tarea terminada; timed_out y errors las
+    que agotaron su plazo o lanzaron (y recibieron su valor por defecto).
+    sequential es la suma de las duraciones: lo que habría costado en serie.
+    """
+    values: Dict[str, Any] = field(default_factory=dict)
+    timings: Dict[str, float] = field(default_factory=dict)
+    timed_out: set = field(default_factory=set)
+    errors: Dict[str, BaseException] = field(default_factory=dict)
+    wall: float = 0.0
+
+    @property
+    def sequential(self) -> float:
+        return sum(self.timings.values())
+
+    @property
+    def saved(self) -> float:
+        return max(self.sequential - self.wall, 0.0)
+
+    def __getitem__(self, name: str) -> Any:
+        return self.values[name]
+
+
+class ConcurrentLoader:
+    """Lanza tareas independientes en un pool compartido y espera a todas.
+
+    Cada tarea tiene su propio plazo contado desde el inicio de load; la que
+    no termina a tiempo recibe su valor por defecto y sigue ejecutándose en
+    segundo plano (su resultado suele quedar en caché para el rerun
+    siguiente). wrap permite preparar el hilo trabajador, p. ej. para
+    asociarle el contexto de la sesión de Streamlit.
+
+    Las tareas con clave (keys en load) son únicas en vuelo: si otro rerun
+    o sesión ya lanzó la misma clave y aún no ha terminado, se espera a ese
+    future en lugar de repetir la petición. La clave se libera al terminar.
+    """
+
+    def __init__(self, executor: ThreadPoolExecutor,
+                 wrap: Optional[Callable[[Callable[[], Any]], Callable[[], Any]]] = None):
+        self.executor = executor
+        self.wrap = wrap
+        self._inflight: Dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+
+    def _submit(self, task: Callable[[], Any], timings: Dict[str, float], name: str) -> Future:
+        def timed():
+            started = time.perf_counter()
+            try:
+                return task()
+            finally:
+                timings[name] = time.perf_counter() - started
+
+        run = self.wrap(timed) if self.wrap else timed
+        context = contextvars.copy_context()
+        return self.executor.submit(context.run, run)
+
+    def _submit_once(self, key: Hashable, task: Callable[[], Any],
+                     timings: Dict[str, float], name: str) -> Future:
+        """Future en vuelo para key, o uno nuevo si no hay ninguno"""
+        with self._lock:
+            future = self._inflight.get(key)
+            if future is not None:
+                return future
+            future = self._submit(task, timings, name)
+            self._inflight[key] = future
+        future.add_done_callback(lambda done: self._release(key, done))
+        return future
+
+    def _release(self, key: Hashable, future: Future):
+        with self._lock:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+
+    def load(self, tasks: Dict[str, Callable[[], Any]],
+             deadlines: Optional[Dict[str, float]] = None,
+             defaults: Optional[Dict[str, Any]] = None,
+             keys: Optional[Dict[str, Hashable]] = None) -> LoadResult:
+        deadlines = deadlines or {}
+        defaults = defaults or {}
+        keys = keys or {}
+        result = LoadResult()
+        timings: Dict[str, float] = {}
+        started = time.perf_counter()
+        futures = {
+            name: (self._submit_once(keys[name], task, timings, name) if name in keys
+                   else self._submit(task, timings, name))
+            for name, task in tasks.items()
+        }
+
+        for name in sorted(futures, key=lambda n: deadlines.get(n, DEFAULT_DEADLINE_SECONDS)):
+            remaining = started + deadlines.get(name, DEFAULT_DEADLINE_SECONDS) - time.perf_counter()
+            try:
+                result.values[name] = futures[name].result(timeout=max(remaining, 0.0))
+                # Una tarea compartida mide su duración en la carga que la lanzó
+                timings.setdefault(name, time.perf_counter() - started)
+            except FutureTimeout:
+                result.timed_out.add(name)
+                result.values[name] = defaults.get(name)
+            except Exception as e:
+                result.errors[name] = e
+                result.values[name] = defaults.get(name)
+
+        result.wall = time.perf_counter() - started
+        result.timings = {n: t for n, t in timings.items() if n not in result.timed_out}
+        logger.debug(
+            "carga %.0f ms (en serie %.0f ms): %s%s",
+            result.wall * 1000, result.sequential * 1000,
+            ", ".join(f"{n}={t * 1000:.0f}ms" for n, t in result.timings.items()),
+            f"; sin respuesta: {', '.join(sorted(result.timed_out))}" if result.timed_out else "",
+        )
+        return result
@@ -0,0 +1,259 @@
+"""
+Repositorio de tickets contra Postgres directo (TICKETS_BACKEND = "postgres"):
+pool de conexiones psycopg, resultados en formato binario para las descargas
+completas y cursores de servidor para recorrer resultados grandes por bloques.
+
+COPY ... TO STDOUT (FORMAT BINARY) no compensa aquí: Postgres manda un
+mensaje por fila y psycopg los convierte de uno en uno, así que con
+benchmarks/bench_postgres.py resultaba el doble de lento que un SELECT con
+resultados binarios en un solo viaje.
+
+Requiere psycopg 3 con el pool (pip install "psycopg[binary,pool]").
+Devuelve las mismas filas que PostgrestRepository: created_at y updated_at
+como texto ISO 8601 (to_json), igual que los serializa PostgREST.
+"""
+
+import dataclasses
+from dataclasses import dataclass
+from typing import Any, Callable, Iterator, List, Optional, Set, Tuple
+
+import pandas as pd
+from psycopg import sql
+from psycopg_pool import ConnectionPool
+
+import tracing
+from repository import (
+    SEARCH_VECTOR_COLUMN, TICKETS_TABLE, TOMBSTONES_TABLE,
+    decode_cursor, encode_cursor, escape_like,
+)
+from search_index import SEARCH_FIELDS
+
+TIMESTAMP_COLUMNS = frozenset({"created_at", "updated_at", "deleted_at"})
+# Con el alias t el orden usa las columnas de la tabla (y su índice), no las
+# de la lista de salida, que son texto
+ORDER_BY = sql.SQL(" ORDER BY t.created_at DESC NULLS LAST, t.id DESC")
+CURSOR_NAME = "tickets_pages"
+
+
+@dataclass(frozen=True)
+class PostgresConfig:
+    min_connections: int = 1
+    max_connections: int = 10
+    connect_timeout: float = 3.0
+    pool_timeout: float = 5.0
+    statement_timeout: float = 15.0
+
+    @classmethod
+    def from_settings(cls, get_setting: Callable[[str, Any], Any]) -> "PostgresConfig":
+        """Lee cada campo de la opción PG_<CAMPO> (p. ej. PG_MAX_CONNECTIONS)"""
+        values = {}
+        for f in dataclasses.fields(cls):
+            value = get_setting(f"PG_{f.name.upper()}", None)
+            if value is not None:
+                values[f.name] = type(f.default)(value)
+        return cls(**values)
+
+
+def _select_list(columns: str) -> Tuple[sql.Composable, List[str]]:
+    """Lista de columnas de la consulta (tipos como los de PostgREST) y sus nombres"""
+    names = [c.strip().lower() for c in columns.split(",")]
+    fields = []
+    for name in names:
+        column = sql.Identifier(name)
+        if name == "id":
+            fields.append(sql.SQL("{}::bigint AS {}").format(column, column))
+        elif name in TIMESTAMP_COLUMNS:
+            fields.append(sql.SQL("to_json({}) #>> '{{}}' AS {}").format(column, column))
+        else:
+            fields.append(sql.SQL("{}::text AS {}").format(column, column))
+    return sql.SQL(", ").join(fields), names
+
+
+class PostgresRepository:
+    """Tickets por conexión directa a Postgres (ver repository para las operaciones)"""
+
+    def __init__(self, dsn: str, config: Optional[PostgresConfig] = None,
+                 get_setting: Optional[Callable[[str, Any], Any]] = None):
+        self.config = config or PostgresConfig()
+        self.get_setting = get_setting or (lambda name, default=None: default)
+        self.pool = ConnectionPool(
+            dsn,
+            min_size=self.config.min_connections,
+            max_size=self.config.max_connections,
+            timeout=self.config.pool_timeout,
+            check=ConnectionPool.check_connection,
+            kwargs={
+                "connect_timeout": max(int(self.config.connect_timeout), 1),
+                "options": f"-c statement_timeout={int(self.config.statement_timeout * 1000)}",
+            },
+            name="tickets",
+            open=True,
+        )
+
+    def close(self):
+        self.pool.close()
+
+    def _where(self, status_filter: Optional[str], priority_filter: Optional[str],
+               search_query: Optional[str], cursor: Optional[str] = None) -> Tuple[sql.Composable, list]:
+        """Filtros equivalentes a los de PostgrestRepository.fetch_page"""
+        clauses, params = [], []
+        if status_filter:
+            clauses.append(sql.SQL("status = %s"))
+            params.append(status_filter)
+        if priority_filter:
+            clauses.append(sql.SQL("priority = %s"))
+            params.append(priority_filter)
+        if search_query:
+            if self.get_setting("TICKETS_SEARCH_MODE", "ilike") == "fts":
+                clauses.append(sql.SQL("{} @@ websearch_to_tsquery('spanish', %s)")
+                               .format(sql.Identifier(SEARCH_VECTOR_COLUMN)))
+                params.append(search_query)
+            else:
+                pattern = f"%{escape_like(search_query)}%"
+                clauses.append(sql.SQL("({})").format(sql.SQL(" OR ").join(
+                    sql.SQL("{} ILIKE %s").format(sql.Identifier(field)) for field in SEARCH_FIELDS
+                )))
+                params.extend([pattern] * len(SEARCH_FIELDS))
+        if cursor:
+            created_at, last_id = decode_cursor(cursor)
+            if created_at is None:
+                clauses.append(sql.SQL("created_at IS NULL AND id < %s"))
+                params.append(last_id)
+            else:
+                clauses.append(sql.SQL(
+                    "(created_at < %s OR (created_at = %s AND id < %s) OR created_at IS NULL)"
+                ))
+                params.extend([created_at, created_at, last_id])
+        if not clauses:
+            return sql.SQL(""), params
+        return sql.SQL(" WHERE ") + sql.SQL(" AND ").join(clauses), params
+
+    def _select(self, columns: str, where: sql.Composable,
+                order: sql.Composable = ORDER_BY) -> Tuple[sql.Composable, List[str]]:
+        fields, names = _select_list(columns)
+        query = sql.SQL("SELECT {} FROM {} AS t").format(fields, sql.Identifier(TICKETS_TABLE))
+        return query + where + order, names
+
+    @tracing.traced("pg_fetch")
+    def _fetch_frame(self, query: sql.Composable, params: list, names: List[str]) -> pd.DataFrame:
+        """Resultado entero en formato binario y en un solo viaje"""
+        with self.pool.connection() as conn, conn.cursor(binary=True) as cur:
+            rows = cur.execute(query, params).fetchall()
+        tracing.count("rows", len(rows))
+        return pd.DataFrame(rows, columns=names)
+
+    def test_connection(self) -> Optional[int]:
+        """Filas estimadas por las estadísticas; recuento exacto si la tabla no se ha analizado"""
+        with self.pool.connection() as conn:
+            estimate = conn.execute(
+                "SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(%s)",
+                [TICKETS_TABLE],
+            ).fetchone()
+            if estimate is None:
+                raise LookupError(f"No existe la tabla {TICKETS_TABLE}")
+            if estimate[0] >= 0:
+                return estimate[0]
+            query = sql.SQL("SELECT count(*) FROM {}").format(sql.Identifier(TICKETS_TABLE))
+            return conn.execute(query).fetchone()[0]
+
+    def fetch_tickets(self, status_filter: Optional[str], priority_filter: Optional[str],
+                      search_query: Optional[str], page_size: int, columns: str) -> pd.DataFrame:
+        """Todo el resultado en una consulta (page_size no aplica)"""
+        where, params = self._where(status_filter, priority_filter, search_query)
+        query, names = self._select(columns, where)
+        return self._fetch_frame(query, params, names)
+
+    @tracing.traced("query_page")
+    def fetch_page(self, status_filter: Optional[str], priority_filter: Optional[str],
+                   search_query: Optional[str], cursor: Optional[str], page_size: int,
+                   columns: str) -> Tuple[pd.DataFrame, Optional[str]]:
+        """Una página por keyset (created_at, id), con los mismos tokens que PostgREST"""
+        where, params = self._where(status_filter, priority_filter, search_query, cursor)
+        query, names = self._select(columns, where, ORDER_BY + sql.SQL(" LIMIT %s"))
+        with self.pool.connection() as conn, conn.cursor(binary=True) as cur:
+            rows = cur.execute(query, [*params, page_size]).fetchall()
+        tracing.count("rows", len(rows))
+        token = None
+        if len(rows) == page_size:
+            last = dict(zip(names, rows[-1]))
+            token = encode_cursor(last.get("created_at"), last.get("id"))
+        return pd.DataFrame(rows, columns=names), token
+
+    def iter_pages(self, status_filter: Optional[str], priority_filter: Optional[str],
+                   search_query: Optional[str], page_size: int,
+                   columns: str) -> Iterator[pd.DataFrame]:
+        """Recorre el resultado con un cursor de servidor, page_size filas por bloque.
+
+        La conexión queda reservada hasta agotar (o cerrar) el iterador.
+        """
+        where, params = self._where(status_filter, priority_filter, search_query)
+        query, names = self._select(columns, where)
+        with self.pool.connection() as conn:
+            with conn.cursor(name=CURSOR_NAME, binary=True) as cur:
+                cur.itersize = page_size
+                cur.execute(query, params)
+                while True:
+                    rows = cur.fetchmany(page_size)
+                    if not rows:
+                        return
+                    tracing.count("rows", len(rows))
+                    yield pd.DataFrame(rows, columns=names)
+
+    def fetch_changes(self, since: str, page_size: int, columns: str) -> pd.DataFrame:
+        """Filas con updated_at >= since en una consulta"""
+        query, names = self._select(
+            columns, sql.SQL(" WHERE updated_at >= %s"), sql.SQL(" ORDER BY t.updated_at, t.id")
+        )
+        return self._fetch_frame(query, [since], names)
+
+    def fetch_tombstones(self, since: Optional[str]) -> pd.DataFrame:
+        """Ids borrados desde since según la tabla de tombstones"""
+        query = sql.SQL("SELECT id, to_json(deleted_at) #>> '{{}}' FROM {}").format(
+            sql.Identifier(TOMBSTONES_TABLE))
+        params = []
+        if since:
+            query += sql.SQL(" WHERE deleted_at >= %s")
+            params.append(since)
+        with self.pool.connection() as conn:
+            rows = conn.execute(query + sql.SQL(" ORDER BY deleted_at"), params).fetchall()
+        return pd.DataFrame(rows, columns=["id", "deleted_at"])
+
+    def fetch_metrics(self, search_query: Optional[str]) -> List[dict]:
+        """Recuentos status × priority con un GROUP BY"""
+        where, params = self._where(None, None, search_query)
+        query = sql.SQL(
+            "SELECT status::text, priority::text, count(*) FROM {}{} GROUP BY 1, 2"
+        ).format(sql.Identifier(TICKETS_TABLE), where)
+        with self.pool.connection() as conn:
+            rows = conn.execute(query, params).fetchall()
+        return [{"status": s, "priority": p, "total": n} for s, p, n in rows]
+
+    def _update_statement(self, columns: List[str]) -> sql.Composable:
+        assignments = sql.SQL(", ").join(
+            sql.SQL("{} = %s").format(sql.Identifier(column)) for column in columns
+        )
+        return sql.SQL("UPDATE {} AS t SET {} WHERE t.id = %s").format(
+            sql.Identifier(TICKETS_TABLE), assignments)
+
+    def update_ticket(self, ticket_id: int, data: dict) -> Optional[dict]:
+        """UPDATE de una fila; devuelve la fila completa como la daría PostgREST"""
+        query = self._update_statement(list(data)) + sql.SQL(" RETURNING to_jsonb(t)")
+        with self.pool.connection() as conn:
+            row = conn.execute(query, [*data.values(), ticket_id]).fetchone()
+        return row[0] if row else None
+
+    def update_tickets(self, rows: List[dict]) -> Set[int]:
+        """Todas las filas en una transacción y un solo viaje (executemany en pipeline)"""
+        columns = [c for c in rows[0] if c != "id"]
+        query = self._update_statement(columns) + sql.SQL(" RETURNING t.id")
+        saved = set()
+        with self.pool.connection() as conn, conn.cursor() as cur:
+            cur.executemany(query, [[*(row[c] for c in columns), row["id"]] for row in rows],
+                            returning=True)
+            while True:
+                row = cur.fetchone()
+                if row:
+                    saved.add(int(row[0]))
+                if not cur.nextset():
+                    break
+        return saved
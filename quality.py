@@ -0,0 +1,68 @@
+"""
+Detección de tickets malformados: códigos de motivo por fila como máscara de
+bits, calculados sobre columnas enteras para poder filtrar en cuarentena
+"""
+
+from typing import Dict, List
+
+import pandas as pd
+
+from text_cleaning import IA_TAG, PLACEHOLDER_NOTES
+
+# Motivos (bits de quality_issues)
+ISSUE_TITLE = 1
+ISSUE_DESCRIPTION = 2
+ISSUE_NOTES = 4
+
+ISSUE_LABELS = {
+    ISSUE_TITLE: "Título sin [IA] o demasiado corto",
+    ISSUE_DESCRIPTION: "Descripción vacía o muy corta",
+    ISSUE_NOTES: "Notas vacías o de relleno",
+}
+
+MIN_TITLE_CHARS = 10
+MIN_DESCRIPTION_CHARS = 5
+MIN_NOTES_CHARS = 5
+
+QUALITY_COLUMNS = ["quality_issues", "is_malformed"]
+
+
+def ticket_issues(title: str, description: str, notes: str) -> int:
+    """Máscara de motivos de un ticket suelto (0 si está bien formado)"""
+    issues = 0
+    if not title.startswith(IA_TAG) or len(title) < MIN_TITLE_CHARS:
+        issues |= ISSUE_TITLE
+    if len(description) < MIN_DESCRIPTION_CHARS:
+        issues |= ISSUE_DESCRIPTION
+    if not notes or len(notes) < MIN_NOTES_CHARS or notes.lower() in PLACEHOLDER_NOTES:
+        issues |= ISSUE_NOTES
+    return issues
+
+
+def issue_values(title: str, description: str, notes: str) -> dict:
+    """QUALITY_COLUMNS de un ticket, para parchear una fila ya descargada"""
+    issues = ticket_issues(title, description, notes)
+    return {"quality_issues": issues, "is_malformed": issues != 0}
+
+
+def issue_columns(titles: pd.Series, descriptions: pd.Series, notes: pd.Series) -> Dict[str, pd.Series]:
+    """QUALITY_COLUMNS para columnas enteras; equivale a ticket_issues fila a fila"""
+    bad_title = ~titles.str.startswith(IA_TAG) | (titles.str.len() < MIN_TITLE_CHARS)
+    bad_description = descriptions.str.len() < MIN_DESCRIPTION_CHARS
+    bad_notes = (notes.str.len() < MIN_NOTES_CHARS) | notes.str.lower().isin(PLACEHOLDER_NOTES)
+    issues = (
+        bad_title.astype("int8") * ISSUE_TITLE
+        + bad_description.astype("int8") * ISSUE_DESCRIPTION
+        + bad_notes.astype("int8") * ISSUE_NOTES
+    ).astype("int8")
+    return {"quality_issues": issues, "is_malformed": issues != 0}
+
+
+def issue_labels(issues: int) -> List[str]:
+    """Descripción de cada motivo presente en la máscara"""
+    return [label for bit, label in ISSUE_LABELS.items() if issues & bit]
+
+
+def issue_counts(issues: pd.Series) -> Dict[int, int]:
+    """Tickets afectados por cada motivo"""
+    return {bit: int((issues & bit).astype(bool).sum()) for bit in ISSUE_LABELS}
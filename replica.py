@@ -0,0 +1,286 @@
+"""
+Réplica local de opportunities en SQLite para TICKETS_SYNC_MODE = "replica":
+el snapshot y sus marcas de agua persistidos, de modo que un proceso recién
+arrancado puede servir lecturas sin llegar a Supabase. La búsqueda FTS5
+(trigramas, equivale al ilike de subcadena) solo responde mientras se
+construye el índice en memoria, que es más rápido una vez listo.
+"""
+
+import logging
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, List, Optional
+
+import pandas as pd
+
+from search_index import SEARCH_FIELDS
+
+logger = logging.getLogger(__name__)
+
+REPLICA_COLUMNS = ["id", "ticket_number", "title", "description", "status",
+                   "priority", "notes", "created_at", "updated_at"]
+# Con menos caracteres el tokenizador trigram no encuentra nada
+MIN_FTS_CHARS = 3
+# Ancho fijo para que el orden de texto coincida con el cronológico
+TIMESTAMP_FORMAT = "%Y-%m-%dT%H:%M:%S.%f+00:00"
+
+TABLE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS opportunities (
+    id INTEGER PRIMARY KEY,
+    ticket_number TEXT,
+    title TEXT,
+    description TEXT,
+    status TEXT,
+    priority TEXT,
+    notes TEXT,
+    created_at TEXT,
+    updated_at TEXT
+);
+CREATE TABLE IF NOT EXISTS replica_meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+# Índices, FTS5 y triggers: replace_all los borra y los vuelve a crear después
+# de insertar, que es mucho más rápido que mantenerlos fila a fila
+INDEX_SCHEMA = f"""
+CREATE INDEX IF NOT EXISTS opportunities_status_idx ON opportunities (status);
+CREATE INDEX IF NOT EXISTS opportunities_priority_idx ON opportunities (priority);
+CREATE INDEX IF NOT EXISTS opportunities_created_at_idx ON opportunities (created_at DESC, id DESC);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS opportunities_fts USING fts5(
+    {", ".join(SEARCH_FIELDS)},
+    content='opportunities', content_rowid='id', tokenize='trigram'
+);
+CREATE TRIGGER IF NOT EXISTS opportunities_fts_insert AFTER INSERT ON opportunities BEGIN
+    INSERT INTO opportunities_fts (rowid, {", ".join(SEARCH_FIELDS)})
+    VALUES (new.id, {", ".join("new." + c for c in SEARCH_FIELDS)});
+END;
+CREATE TRIGGER IF NOT EXISTS opportunities_fts_delete AFTER DELETE ON opportunities BEGIN
+    INSERT INTO opportunities_fts (opportunities_fts, rowid, {", ".join(SEARCH_FIELDS)})
+    VALUES ('delete', old.id, {", ".join("old." + c for c in SEARCH_FIELDS)});
+END;
+CREATE TRIGGER IF NOT EXISTS opportunities_fts_update AFTER UPDATE ON opportunities BEGIN
+    INSERT INTO opportunities_fts (opportunities_fts, rowid, {", ".join(SEARCH_FIELDS)})
+    VALUES ('delete', old.id, {", ".join("old." + c for c in SEARCH_FIELDS)});
+    INSERT INTO opportunities_fts (rowid, {", ".join(SEARCH_FIELDS)})
+    VALUES (new.id, {", ".join("new." + c for c in SEARCH_FIELDS)});
+END;
+"""
+
+DROP_INDEXES = """
+DROP TRIGGER IF EXISTS opportunities_fts_insert;
+DROP TRIGGER IF EXISTS opportunities_fts_delete;
+DROP TRIGGER IF EXISTS opportunities_fts_update;
+DROP TABLE IF EXISTS opportunities_fts;
+DROP INDEX IF EXISTS opportunities_status_idx;
+DROP INDEX IF EXISTS opportunities_priority_idx;
+DROP INDEX IF EXISTS opportunities_created_at_idx;
+"""
+
+UPSERT = (
+    f"INSERT INTO opportunities ({', '.join(REPLICA_COLUMNS)}) "
+    f"VALUES ({', '.join('?' for _ in REPLICA_COLUMNS)}) "
+    f"ON CONFLICT (id) DO UPDATE SET "
+    + ", ".join(f"{c} = excluded.{c}" for c in REPLICA_COLUMNS if c != "id")
+)
+
+
+def _statements(script: str) -> Iterator[str]:
+    """Sentencias de un script, respetando los ; dentro de los triggers"""
+    statement = ""
+    for line in script.splitlines(keepends=True):
+        statement += line
+        if sqlite3.complete_statement(statement):
+            yield statement.strip()
+            statement = ""
+
+
+def _fts_phrase(search_query: str) -> str:
+    """Consulta FTS5 que busca el texto tal cual (sin operadores)"""
+    return '"' + search_query.replace('"', '""') + '"'
+
+
+def _records(df: pd.DataFrame) -> List[tuple]:
+    """Filas de un DataFrame ya normalizado en el orden de REPLICA_COLUMNS"""
+    table = pd.DataFrame(index=df.index)
+    for column in REPLICA_COLUMNS:
+        if column not in df.columns:
+            table[column] = None
+        elif column == "created_at" and pd.api.types.is_datetime64_any_dtype(df[column]):
+            table[column] = df[column].dt.strftime(TIMESTAMP_FORMAT)
+        elif column == "id":
+            table[column] = df[column].astype("int64")
+        else:
+            table[column] = df[column].astype(object)
+    table = table.astype(object).where(table.notna(), None)
+    return list(table.itertuples(index=False, name=None))
+
+
+class SqliteReplica:
+    """Copia de la tabla en un fichero SQLite (modo WAL).
+
+    Cada hilo lee con su propia conexión; las escrituras (sincronización y
+    parches locales tras guardar) se serializan con un lock. Guarda las filas
+    ya normalizadas, así que los filtros comparan valores válidos de status
+    y priority igual que TicketSnapshot.select.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        self._write_lock = threading.Lock()
+        self._connection().executescript(TABLE_SCHEMA + INDEX_SCHEMA)
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    # ------------------------------------------------------------------
+    # Escritura
+    # ------------------------------------------------------------------
+
+    def replace_all(self, df: pd.DataFrame):
+        """Sustituye el contenido por una descarga completa en una transacción"""
+        with self._write_lock:
+            conn = self._connection()
+            conn.execute("BEGIN")
+            try:
+                for statement in _statements(DROP_INDEXES):
+                    conn.execute(statement)
+                conn.execute("DELETE FROM opportunities")
+                conn.executemany(UPSERT, _records(df))
+                for statement in _statements(INDEX_SCHEMA):
+                    conn.execute(statement)
+                conn.execute("INSERT INTO opportunities_fts (opportunities_fts) VALUES ('rebuild')")
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+    def upsert(self, df: pd.DataFrame) -> int:
+        """Inserta o actualiza filas por id"""
+        if df.empty:
+            return 0
+        with self._write_lock:
+            conn = self._connection()
+            with conn:
+                conn.executemany(UPSERT, _records(df))
+        return len(df)
+
+    def delete(self, ids: Iterable[int]) -> int:
+        ids = [(int(i),) for i in ids]
+        if not ids:
+            return 0
+        with self._write_lock:
+            conn = self._connection()
+            with conn:
+                return conn.executemany("DELETE FROM opportunities WHERE id = ?", ids).rowcount
+
+    def patch(self, ticket_id: int, changes: dict) -> bool:
+        """Aplica un cambio local ya guardado en el servidor"""
+        columns = [c for c in changes if c in REPLICA_COLUMNS and c != "id"]
+        if not columns:
+            return False
+        assignments = ", ".join(f"{c} = ?" for c in columns)
+        with self._write_lock:
+            conn = self._connection()
+            with conn:
+                cursor = conn.execute(f"UPDATE opportunities SET {assignments} WHERE id = ?",
+                                      [str(changes[c]) for c in columns] + [int(ticket_id)])
+        return cursor.rowcount > 0
+
+    def set_meta(self, **values: Optional[str]):
+        with self._write_lock:
+            conn = self._connection()
+            with conn:
+                conn.executemany(
+                    "INSERT INTO replica_meta (key, value) VALUES (?, ?) "
+                    "ON CONFLICT (key) DO UPDATE SET value = excluded.value",
+                    [(k, None if v is None else str(v)) for k, v in values.items()],
+                )
+
+    # ------------------------------------------------------------------
+    # Lectura
+    # ------------------------------------------------------------------
+
+    def meta(self, key: str) -> Optional[str]:
+        row = self._connection().execute("SELECT value FROM replica_meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def count(self) -> int:
+        return self._connection().execute("SELECT count(*) FROM opportunities").fetchone()[0]
+
+    def select_all(self) -> pd.DataFrame:
+        """Toda la tabla en el orden de fetch_tickets (índice de created_at)"""
+        cursor = self._connection().execute(
+            f"SELECT {', '.join(REPLICA_COLUMNS)} FROM opportunities "
+            f"ORDER BY created_at DESC, id DESC"
+        )
+        return pd.DataFrame(cursor.fetchall(), columns=REPLICA_COLUMNS)
+
+    def ids(self, status_filter: Optional[str] = None, priority_filter: Optional[str] = None,
+            search_query: Optional[str] = None) -> List[int]:
+        """Ids que cumplen filtros y búsqueda (sin orden: lo da el snapshot).
+
+        search_query necesita al menos MIN_FTS_CHARS caracteres; con menos
+        el índice de trigramas no sirve y hay que buscar en memoria.
+        """
+        clauses, params = [], []
+        if status_filter:
+            clauses.append("o.status = ?")
+            params.append(status_filter)
+        if priority_filter:
+            clauses.append("o.priority = ?")
+            params.append(priority_filter)
+        source = "opportunities AS o"
+        if search_query:
+            if len(search_query) < MIN_FTS_CHARS:
+                raise ValueError(f"La búsqueda necesita al menos {MIN_FTS_CHARS} caracteres")
+            source = "opportunities_fts JOIN opportunities AS o ON o.id = opportunities_fts.rowid"
+            clauses.append("opportunities_fts MATCH ?")
+            params.append(_fts_phrase(search_query))
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        cursor = self._connection().execute(f"SELECT o.id FROM {source}{where}", params)
+        return [row[0] for row in cursor.fetchall()]
+
+
+class ReplicaSync:
+    """Hilo que llama a sync cada interval segundos, también sin sesiones abiertas.
+
+    sync es SupabaseService.sync_snapshot: si Supabase no responde registra
+    el fallo y la réplica sigue sirviendo lo último que recibió.
+    """
+
+    def __init__(self, sync: Callable[[], int], interval: float):
+        self.sync = sync
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> "ReplicaSync":
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="replica-sync", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+            self._thread = None
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.sync()
+            except Exception:
+                logger.exception("No se pudo sincronizar la réplica")
@@ -0,0 +1,293 @@
+"""
+Acceso a la tabla de tickets. SupabaseService trabaja contra un repositorio
+con estas operaciones, que devuelven filas crudas (sin normalize_tickets):
+
+    test_connection()                    -> filas estimadas de la tabla (o None)
+    fetch_tickets(status, priority, search, page_size, columns) -> DataFrame
+    fetch_page(status, priority, search, cursor, page_size, columns)
+                                         -> (DataFrame, cursor de la siguiente o None)
+    iter_pages(status, priority, search, page_size, columns) -> DataFrames
+    fetch_changes(since, page_size, columns) -> filas con updated_at >= since
+    fetch_tombstones(since)              -> DataFrame de (id, deleted_at)
+    fetch_metrics(search)                -> filas {status, priority, total}
+    update_ticket(ticket_id, data)       -> fila guardada o None si no existe
+    update_tickets(rows)                 -> ids guardados de un lote [{id, ...}]
+
+Las excepciones se propagan; el servicio decide qué cuenta como fallo de red.
+PostgrestRepository usa la API HTTP de Supabase; postgres_repository tiene la
+implementación contra Postgres directo (TICKETS_BACKEND = "postgres").
+"""
+
+import base64
+import json
+import time
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+import pandas as pd
+
+import tracing
+from search_index import SEARCH_FIELDS
+
+TICKETS_TABLE = "opportunities"
+TOMBSTONES_TABLE = "opportunities_tombstones"
+SEARCH_VECTOR_COLUMN = "search_vector"
+METRICS_RPC = "ticket_counts"
+METRICS_RPC_RETRY_SECONDS = 300
+UPDATE_RPC = "update_tickets"
+# Códigos de PostgREST cuando la función no existe (o no está en la caché de esquema)
+MISSING_RPC_CODES = {"PGRST202", "42883"}
+
+
+def encode_cursor(created_at: Optional[str], ticket_id: int) -> str:
+    """Codifica la posición (created_at, id) como token opaco"""
+    payload = json.dumps([created_at, ticket_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode()
+
+
+def decode_cursor(token: str) -> Tuple[Optional[str], int]:
+    """Decodifica un token generado por encode_cursor"""
+    created_at, ticket_id = json.loads(base64.urlsafe_b64decode(token.encode()))
+    return created_at, int(ticket_id)
+
+
+def next_cursor(rows: List[dict]) -> Optional[str]:
+    """Cursor tras la última fila; None solo con una página vacía.
+
+    Una página corta no indica el final: PostgREST recorta cada respuesta a
+    max-rows aunque se pida más, así que el recorrido acaba con una petición
+    que no devuelve filas.
+    """
+    if not rows:
+        return None
+    last = rows[-1]
+    return encode_cursor(last.get("created_at"), last.get("id"))
+
+
+def rpc_missing(error: Exception) -> bool:
+    """True si error indica que la función RPC no existe en el servidor"""
+    from postgrest.exceptions import APIError
+    if not isinstance(error, APIError):
+        return False
+    # Una respuesta 404 sin cuerpo de error de PostgREST llega con code = 404
+    return error.code in MISSING_RPC_CODES or str(error.code) == "404"
+
+
+def rows_frame(rows: List[dict]) -> pd.DataFrame:
+    df = pd.DataFrame(rows)
+    if not df.empty:
+        df.columns = df.columns.str.lower()
+    return df
+
+
+def _quote_filter_value(value) -> str:
+    """Cita un valor para usarlo dentro de un filtro or() de PostgREST"""
+    text = str(value).replace("\\", "\\\\").replace('"', '\\"')
+    return f'"{text}"'
+
+
+def escape_like(search_query: str) -> str:
+    """Escapa los comodines de ilike que escriba el usuario"""
+    return (
+        search_query.replace("\\", "\\\\")
+        .replace("%", "\\%")
+        .replace("_", "\\_")
+    )
+
+
+def _ilike_pattern(search_query: str) -> str:
+    """Patrón ilike de subcadena con los comodines del usuario escapados"""
+    return _quote_filter_value(f"*{escape_like(search_query)}*")
+
+
+# ============================================================================
+# POSTGREST
+# ============================================================================
+
+class PostgrestRepository:
+    """Tickets a través de la API REST de Supabase (JSON sobre HTTP).
+
+    get_setting se consulta en cada búsqueda (TICKETS_SEARCH_MODE), features
+    recuerda las funciones opcionales del servidor que fallaron y statuses ×
+    priorities son las celdas que se cuentan si falta METRICS_RPC.
+    """
+
+    def __init__(self, client, get_setting: Optional[Callable[[str, Any], Any]] = None,
+                 features: Optional[Dict[str, float]] = None,
+                 statuses: Iterable[str] = (), priorities: Iterable[str] = ()):
+        self.client = client
+        self.get_setting = get_setting or (lambda name, default=None: default)
+        self.features = features if features is not None else {}
+        self.statuses = list(statuses)
+        self.priorities = list(priorities)
+
+    def _use_fts(self) -> bool:
+        return self.get_setting("TICKETS_SEARCH_MODE", "ilike") == "fts"
+
+    def _apply_search(self, query, search_query: str):
+        """Traduce la búsqueda a un filtro de servidor.
+
+        Por defecto usa ilike sobre SEARCH_FIELDS (acelerado por índices
+        pg_trgm, ver sql/search_indexes.sql). Con
+        TICKETS_SEARCH_MODE = "fts" usa la columna tsvector indexada.
+        """
+        if self._use_fts():
+            return query.filter(SEARCH_VECTOR_COLUMN, "wfts(spanish)", search_query)
+        pattern = _ilike_pattern(search_query)
+        return query.or_(",".join(f"{field}.ilike.{pattern}" for field in SEARCH_FIELDS))
+
+    def test_connection(self) -> Optional[int]:
+        """Petición mínima de comprobación; count estimado por el planificador"""
+        response = (
+            self.client.table(TICKETS_TABLE).select("id", count="estimated", head=True)
+            .execute()
+        )
+        return response.count
+
+    @tracing.traced("query_page")
+    def fetch_page(self, status_filter: Optional[str], priority_filter: Optional[str],
+                   search_query: Optional[str], cursor: Optional[str], page_size: int,
+                   columns: str) -> Tuple[pd.DataFrame, Optional[str]]:
+        """Pide una página ordenada por (created_at, id) descendente.
+
+        El cursor apunta a la última fila de la página anterior; las filas
+        con created_at nulo van al final y se recorren solo por id.
+        """
+        query = self.client.table(TICKETS_TABLE).select(columns)
+
+        if status_filter:
+            query = query.eq("status", status_filter)
+        if priority_filter:
+            query = query.eq("priority", priority_filter)
+        if search_query:
+            query = self._apply_search(query, search_query)
+
+        if cursor:
+            created_at, last_id = decode_cursor(cursor)
+            if created_at is None:
+                query = query.is_("created_at", "null").lt("id", last_id)
+            else:
+                value = _quote_filter_value(created_at)
+                query = query.or_(
+                    f"created_at.lt.{value},"
+                    f"and(created_at.eq.{value},id.lt.{last_id}),"
+                    f"created_at.is.null"
+                )
+
+        response = (
+            query.order("created_at", desc=True, nullsfirst=False)
+            .order("id", desc=True)
+            .limit(page_size)
+            .execute()
+        )
+        rows = response.data or []
+        tracing.count("rows", len(rows))
+        return rows_frame(rows), next_cursor(rows)
+
+    def iter_pages(self, status_filter: Optional[str], priority_filter: Optional[str],
+                   search_query: Optional[str], page_size: int,
+                   columns: str) -> Iterator[pd.DataFrame]:
+        """Recorre el resultado página a página siguiendo el cursor"""
+        cursor = None
+        while True:
+            page, cursor = self.fetch_page(status_filter, priority_filter, search_query,
+                                           cursor, page_size, columns)
+            if not page.empty:
+                yield page
+            if cursor is None:
+                return
+
+    def fetch_tickets(self, status_filter: Optional[str], priority_filter: Optional[str],
+                      search_query: Optional[str], page_size: int, columns: str) -> pd.DataFrame:
+        """Todas las páginas concatenadas"""
+        pages = list(self.iter_pages(status_filter, priority_filter, search_query,
+                                     page_size, columns))
+        return pd.concat(pages, ignore_index=True) if pages else pd.DataFrame()
+
+    def fetch_changes(self, since: str, page_size: int, columns: str) -> pd.DataFrame:
+        """Filas con updated_at >= since, en bloques por keyset (updated_at, id).
+
+        Cada bloque empieza tras la última fila del anterior, así que una fila
+        modificada durante el recorrido no desplaza a las demás (con offsets
+        se saltaba alguna). Se para con un bloque vacío, no con uno corto:
+        max-rows de PostgREST puede recortar cualquier respuesta, y parar
+        antes haría avanzar la marca de agua sobre filas no recibidas.
+        columns tiene que incluir id y updated_at.
+        """
+        pages = []
+        last = None
+        while True:
+            query = self.client.table(TICKETS_TABLE).select(columns).gte("updated_at", since)
+            if last is not None:
+                value = _quote_filter_value(last["updated_at"])
+                query = query.or_(f"updated_at.gt.{value},and(updated_at.eq.{value},id.gt.{last['id']})")
+            response = query.order("updated_at").order("id").limit(page_size).execute()
+            rows = response.data or []
+            tracing.count("rows", len(rows))
+            if not rows:
+                break
+            pages.append(pd.DataFrame(rows))
+            last = rows[-1]
+        return pd.concat(pages, ignore_index=True) if pages else pd.DataFrame()
+
+    def fetch_tombstones(self, since: Optional[str]) -> pd.DataFrame:
+        """Ids borrados desde since según la tabla de tombstones"""
+        query = self.client.table(TOMBSTONES_TABLE).select("id, deleted_at")
+        if since:
+            query = query.gte("deleted_at", since)
+        response = query.order("deleted_at").execute()
+        return pd.DataFrame(response.data or [])
+
+    def fetch_metrics(self, search_query: Optional[str]) -> List[dict]:
+        """Una consulta agrupada por RPC; si no existe, un recuento HEAD por celda"""
+        failed_at = self.features.get(METRICS_RPC)
+        if failed_at is None or time.monotonic() - failed_at >= METRICS_RPC_RETRY_SECONDS:
+            params = {"search": search_query, "use_fts": self._use_fts()}
+            try:
+                response = self.client.rpc(METRICS_RPC, params).execute()
+                self.features.pop(METRICS_RPC, None)
+                return response.data or []
+            except Exception as e:
+                # Un timeout o un 5xx no significa que falte la función: los
+                # recuentos HEAD solo cargarían más a un servidor con problemas
+                if not rpc_missing(e):
+                    raise
+                self.features[METRICS_RPC] = time.monotonic()
+
+        # Sin la función solo se cuentan valores válidos de status/priority
+        rows = []
+        for status in self.statuses:
+            for priority in self.priorities:
+                query = (
+                    self.client.table(TICKETS_TABLE).select("id", count="exact", head=True)
+                    .eq("status", status).eq("priority", priority)
+                )
+                if search_query:
+                    query = self._apply_search(query, search_query)
+                rows.append({"status": status, "priority": priority,
+                             "total": query.execute().count or 0})
+        return rows
+
+    def update_ticket(self, ticket_id: int, data: dict) -> Optional[dict]:
+        """UPDATE de una fila con return=representation"""
+        response = self.client.table(TICKETS_TABLE).update(data).eq("id", ticket_id).execute()
+        return response.data[0] if response.data else None
+
+    def update_tickets(self, rows: List[dict]) -> Set[int]:
+        """Un UPDATE por lote con la función de sql/update_tickets.sql.
+
+        Los ids que ya no existen no se guardan. Sin la función devuelve un
+        conjunto vacío durante METRICS_RPC_RETRY_SECONDS y el servicio
+        guarda las filas una a una.
+        """
+        failed_at = self.features.get(UPDATE_RPC)
+        if failed_at is not None and time.monotonic() - failed_at < METRICS_RPC_RETRY_SECONDS:
+            return set()
+        try:
+            response = self.client.rpc(UPDATE_RPC, {"rows": rows}).execute()
+        except Exception as e:
+            if not rpc_missing(e):
+                raise
+            self.features[UPDATE_RPC] = time.monotonic()
+            return set()
+        self.features.pop(UPDATE_RPC, None)
+        return {int(r["id"]) for r in response.data or [] if r.get("id") is not None}
@@ -0,0 +1,236 @@
+"""
+Índice invertido en memoria para buscar tickets sin recorrer el DataFrame
+"""
+
+import re
+import threading
+from typing import Dict, Hashable, Iterable, List, Optional, Set
+
+import numpy as np
+import pandas as pd
+
+from cache import TTLCache
+
+SEARCH_FIELDS = ("title", "ticket_number", "description", "notes")
+TOKEN_RE = re.compile(r"\w+")
+MAX_CACHED_QUERIES = 64
+
+
+def _field_text(value) -> str:
+    if isinstance(value, str):
+        return value.lower()
+    if value is None or pd.isna(value):
+        return ""
+    return str(value).lower()
+
+
+def scan_frame(df: pd.DataFrame, query: str, fields: Iterable[str] = SEARCH_FIELDS) -> np.ndarray:
+    """Búsqueda lineal vectorizada, usada mientras el índice se construye"""
+    query = (query or "").strip().lower()
+    mask = np.zeros(len(df), dtype=bool)
+    for field in fields:
+        if field in df.columns:
+            column = df[field].astype("string").str.lower()
+            mask |= column.str.contains(query, regex=False).fillna(False).to_numpy(dtype=bool)
+    return np.flatnonzero(mask)
+
+
+def _trigrams(token: str) -> Set[str]:
+    return {token[i:i + 3] for i in range(len(token) - 2)}
+
+
+class TicketSearchIndex:
+    """Índice de tokens con trigramas sobre el vocabulario.
+
+    Cada fila se tokeniza en palabras (\\w+). Una consulta se parte igual: toda
+    subcadena del texto formada por caracteres de palabra cae dentro de un
+    único token, así que los candidatos son la intersección, por cada trozo de
+    la consulta, de las filas con algún token que lo contenga. Los tokens que
+    contienen un trozo se localizan con trigramas del vocabulario (mucho más
+    pequeño que los textos) y se memorizan para las pulsaciones siguientes.
+    Las posiciones devueltas son posiciones iloc del DataFrame indexado.
+    """
+
+    def __init__(self, df: pd.DataFrame, fields: Iterable[str] = SEARCH_FIELDS):
+        self.fields = [f for f in fields if f in df.columns]
+        self._texts: List[str] = []
+        self._row_tokens: List[Set[int]] = []
+        self._vocab: Dict[str, int] = {}
+        self._tokens: List[str] = []
+        self._postings: List[Set[int]] = []
+        self._grams: Dict[str, Set[int]] = {}
+        self._matches: Dict[str, List[int]] = {}
+        self._results: Dict[str, np.ndarray] = {}
+        self._lock = threading.Lock()
+
+        columns = [df[f].tolist() for f in self.fields] or [[None] * len(df)]
+        self._texts = [self._row_text(values) for values in zip(*columns)]
+        self._row_tokens = [set() for _ in self._texts]
+        for position, text in enumerate(self._texts):
+            self._index_tokens(position, text)
+
+    def __len__(self) -> int:
+        return len(self._texts)
+
+    @staticmethod
+    def _row_text(values: Iterable) -> str:
+        return "\n".join(_field_text(v) for v in values)
+
+    def _token_id(self, token: str) -> int:
+        token_id = self._vocab.get(token)
+        if token_id is None:
+            token_id = len(self._tokens)
+            self._vocab[token] = token_id
+            self._tokens.append(token)
+            self._postings.append(set())
+            for gram in _trigrams(token):
+                self._grams.setdefault(gram, set()).add(token_id)
+            self._matches.clear()
+            self._results.clear()
+        return token_id
+
+    def _index_tokens(self, position: int, text: str):
+        row_tokens = self._row_tokens[position]
+        vocab, postings = self._vocab, self._postings
+        for token in set(TOKEN_RE.findall(text)):
+            token_id = vocab.get(token)
+            if token_id is None:
+                token_id = self._token_id(token)
+            postings[token_id].add(position)
+            row_tokens.add(token_id)
+
+    def _tokens_containing(self, piece: str) -> List[int]:
+        cached = self._matches.get(piece)
+        if cached is not None:
+            return cached
+        parent = self._matches.get(piece[:-1]) if len(piece) > 1 else None
+        if parent is not None:
+            candidates: Iterable[int] = parent
+        elif len(piece) >= 3:
+            gram_sets = sorted((self._grams.get(g, set()) for g in _trigrams(piece)), key=len)
+            candidates = set.intersection(*gram_sets) if gram_sets[0] else ()
+        else:
+            candidates = range(len(self._tokens))
+        tokens = self._tokens
+        result = [t for t in candidates if piece in tokens[t] and self._postings[t]]
+        self._matches[piece] = result
+        return result
+
+    def search(self, query: str) -> np.ndarray:
+        """Posiciones (ordenadas) de las filas que contienen query como subcadena"""
+        with self._lock:
+            return self._search(query)
+
+    def _search(self, query: str) -> np.ndarray:
+        query = (query or "").strip().lower()
+        if not query:
+            return np.arange(len(self._texts))
+        cached = self._results.get(query)
+        if cached is not None:
+            return cached
+
+        pieces = TOKEN_RE.findall(query)
+        if not pieces:
+            rows = [i for i, text in enumerate(self._texts) if query in text]
+        else:
+            rows = self._candidate_rows(set(pieces))
+            if pieces != [query]:
+                texts = self._texts
+                rows = [r for r in rows if query in texts[r]]
+
+        result = np.fromiter(sorted(rows), dtype=np.int64, count=len(rows))
+        if len(self._results) >= MAX_CACHED_QUERIES:
+            self._results.pop(next(iter(self._results)))
+        self._results[query] = result
+        return result
+
+    def _candidate_rows(self, pieces: Set[str]) -> Set[int]:
+        """Filas con, para cada trozo, algún token que lo contiene.
+
+        Empieza por el trozo más selectivo y, mientras quedan pocos
+        candidatos, filtra por los tokens de cada fila en lugar de unir
+        listas de apariciones enteras.
+        """
+        postings = self._postings
+        plan = []
+        for piece in pieces:
+            token_ids = self._tokens_containing(piece)
+            plan.append((sum(len(postings[t]) for t in token_ids), token_ids))
+        plan.sort(key=lambda item: item[0])
+
+        rows: Optional[Set[int]] = None
+        for size, token_ids in plan:
+            if rows is None:
+                rows = set().union(*(postings[t] for t in token_ids))
+            elif len(rows) < size:
+                wanted = set(token_ids)
+                row_tokens = self._row_tokens
+                rows = {r for r in rows if not row_tokens[r].isdisjoint(wanted)}
+            else:
+                rows = rows & set().union(*(postings[t] for t in token_ids))
+            if not rows:
+                break
+        return rows or set()
+
+    def update_row(self, position: int, row: dict):
+        """Reindexa una fila tras un cambio (p. ej. update_ticket)"""
+        with self._lock:
+            self._update_row(position, row)
+
+    def _update_row(self, position: int, row: dict):
+        for token_id in self._row_tokens[position]:
+            self._postings[token_id].discard(position)
+        self._row_tokens[position] = set()
+        text = self._row_text(row.get(f) for f in self.fields)
+        self._texts[position] = text
+        self._index_tokens(position, text)
+        self._matches.clear()
+        self._results.clear()
+
+
+class SearchIndexRegistry:
+    """Índices por snapshot cacheado, construidos en segundo plano.
+
+    Cada entrada recuerda el DataFrame exacto para el que se construyó el
+    índice; si el snapshot cambia de identidad (nueva descarga) se programa
+    otra construcción y, mientras tanto, get devuelve None.
+    """
+
+    def __init__(self, max_entries: int = 32):
+        self._entries = TTLCache(max_entries=max_entries, ttl=None)
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, df: pd.DataFrame) -> Optional[TicketSearchIndex]:
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] is df:
+            return entry[1]
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] is not df:
+                self._entries.put(key, (df, None))
+                threading.Thread(target=self._build, args=(key, df), daemon=True).start()
+        return None
+
+    def _build(self, key: Hashable, df: pd.DataFrame):
+        index = TicketSearchIndex(df)
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] is df:
+            self._entries.replace(key, (df, index))
+
+    def update_row(self, key: Hashable, old_df: pd.DataFrame, new_df: pd.DataFrame,
+                   position: int, row: dict):
+        """Traslada el índice de old_df a su versión parcheada new_df"""
+        entry = self._entries.get(key)
+        if entry is None or entry[0] is not old_df:
+            return
+        if entry[1] is None:
+            self._entries.pop(key)
+            return
+        entry[1].update_row(position, row)
+        self._entries.replace(key, (new_df, entry[1]))
+
+    def discard(self, key: Hashable):
+        self._entries.pop(key)
+
+    def clear(self):
+        self._entries.clear()
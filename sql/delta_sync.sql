@@ -0,0 +1,45 @@
+-- Soporte para TICKETS_SYNC_MODE = "delta": marca de agua updated_at y tombstones.
+-- Ejecutar una vez en el editor SQL de Supabase.
+
+alter table opportunities
+    add column if not exists updated_at timestamptz not null default now();
+
+create index if not exists opportunities_updated_at_idx
+    on opportunities (updated_at, id);
+
+create or replace function opportunities_touch_updated_at()
+returns trigger language plpgsql as $$
+begin
+    new.updated_at := now();
+    return new;
+end;
+$$;
+
+drop trigger if exists opportunities_touch_updated_at on opportunities;
+create trigger opportunities_touch_updated_at
+    before update on opportunities
+    for each row execute function opportunities_touch_updated_at();
+
+-- Borrados: cada fila eliminada deja un tombstone que el delta aplica localmente
+create table if not exists opportunities_tombstones (
+    id bigint primary key,
+    deleted_at timestamptz not null default now()
+);
+
+create index if not exists opportunities_tombstones_deleted_at_idx
+    on opportunities_tombstones (deleted_at);
+
+create or replace function opportunities_record_tombstone()
+returns trigger language plpgsql as $$
+begin
+    insert into opportunities_tombstones (id, deleted_at)
+    values (old.id, now())
+    on conflict (id) do update set deleted_at = excluded.deleted_at;
+    return old;
+end;
+$$;
+
+drop trigger if exists opportunities_record_tombstone on opportunities;
+create trigger opportunities_record_tombstone
+    after delete on opportunities
+    for each row execute function opportunities_record_tombstone();
@@ -0,0 +1,22 @@
+-- Tabla opportunities para probar TICKETS_BACKEND = "postgres" contra un
+-- Postgres local (en Supabase ya existe). Después se pueden aplicar
+-- delta_sync.sql, search_indexes.sql y ticket_metrics.sql igual que en Supabase.
+--
+--   createdb tickets
+--   psql tickets -f sql/local_schema.sql -f sql/delta_sync.sql
+
+create table if not exists opportunities (
+    id bigint generated by default as identity primary key,
+    ticket_number text,
+    title text,
+    description text,
+    status text,
+    priority text,
+    notes text,
+    created_at timestamptz default now()
+);
+
+-- El mismo índice de orden que sql/search_indexes.sql, por si pg_trgm no
+-- está instalado en el servidor local
+create index if not exists opportunities_created_at_id_idx
+    on opportunities (created_at desc nulls last, id desc);
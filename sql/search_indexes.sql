@@ -0,0 +1,33 @@
+-- Índices para paginación por cursor y búsqueda en servidor sobre opportunities.
+-- Ejecutar una vez en el editor SQL de Supabase.
+
+-- Orden estable de fetch_tickets / fetch_tickets_page: (created_at, id) descendente
+create index if not exists opportunities_created_at_id_idx
+    on opportunities (created_at desc nulls last, id desc);
+
+-- Búsqueda por subcadena (ilike '%texto%') en los campos de SEARCH_FIELDS
+create extension if not exists pg_trgm;
+
+create index if not exists opportunities_title_trgm_idx
+    on opportunities using gin (title gin_trgm_ops);
+
+create index if not exists opportunities_ticket_number_trgm_idx
+    on opportunities using gin (ticket_number gin_trgm_ops);
+
+create index if not exists opportunities_description_trgm_idx
+    on opportunities using gin (description gin_trgm_ops);
+
+create index if not exists opportunities_notes_trgm_idx
+    on opportunities using gin (notes gin_trgm_ops);
+
+-- Búsqueda de texto completo (TICKETS_SEARCH_MODE = "fts")
+alter table opportunities
+    add column if not exists search_vector tsvector
+    generated always as (
+        to_tsvector('spanish',
+            coalesce(title, '') || ' ' || coalesce(ticket_number, '') || ' ' ||
+            coalesce(description, '') || ' ' || coalesce(notes, ''))
+    ) stored;
+
+create index if not exists opportunities_search_vector_idx
+    on opportunities using gin (search_vector);
@@ -0,0 +1,37 @@
+-- Recuentos status × priority para las tarjetas de métricas (fetch_metrics).
+-- Ejecutar una vez en el editor SQL de Supabase.
+--
+-- Los valores inválidos o vacíos cuentan como 'new' / 'Medium', igual que
+-- normalize_tickets. search aplica el mismo filtro que fetch_tickets: ilike
+-- de subcadena sobre title, ticket_number, description y notes o, con
+-- use_fts, la columna search_vector de sql/search_indexes.sql.
+
+create or replace function ticket_counts(search text default null, use_fts boolean default false)
+returns table (status text, priority text, total bigint)
+language sql stable
+as $$
+    with pattern as (
+        select '%' || replace(replace(replace(coalesce(search, ''), '\', '\\'), '%', '\%'), '_', '\_') || '%' as value
+    ),
+    matched as (
+        select o.status, o.priority
+        from opportunities o, pattern
+        where coalesce(search, '') = ''
+           or (use_fts and o.search_vector @@ websearch_to_tsquery('spanish', search))
+           or (not use_fts and (
+                  o.title ilike pattern.value
+               or o.ticket_number ilike pattern.value
+               or o.description ilike pattern.value
+               or o.notes ilike pattern.value))
+    )
+    select
+        case when lower(trim(m.status)) in ('new', 'in_progress', 'won', 'closed')
+             then lower(trim(m.status)) else 'new' end,
+        case when trim(m.priority) in ('Low', 'Medium', 'High')
+             then trim(m.priority) else 'Medium' end,
+        count(*)
+    from matched m
+    group by 1, 2;
+$$;
+
+grant execute on function ticket_counts(text, boolean) to anon, authenticated;
@@ -0,0 +1,22 @@
+-- Guardado por lotes de las ediciones pendientes (update_tickets).
+-- Ejecutar una vez en el editor SQL de Supabase.
+--
+-- rows es un array [{id, status?, priority?, notes?}]: solo se cambian las
+-- claves presentes, y los ids que ya no existen no se insertan (un upsert
+-- los recrearía como filas parciales). Devuelve los ids actualizados. Es
+-- security invoker, así que con RLS basta el permiso de UPDATE.
+
+create or replace function update_tickets(rows jsonb)
+returns table (id bigint)
+language sql
+as $$
+    update opportunities as t
+    set status   = case when r.value ? 'status'   then r.value->>'status'   else t.status end,
+        priority = case when r.value ? 'priority' then r.value->>'priority' else t.priority end,
+        notes    = case when r.value ? 'notes'    then r.value->>'notes'    else t.notes end
+    from jsonb_array_elements(rows) as r
+    where t.id = (r.value->>'id')::bigint
+    returning t.id;
+$$;
+
+grant execute on function update_tickets(jsonb) to anon, authenticated;
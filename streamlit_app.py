@@ -5,45 +5,69 @@ Diseño ultra minimalista tipo Linear
 
 import streamlit as st
 import pandas as pd
-from typing import Optional, Tuple
+import numpy as np
+from typing import Container, Dict, Iterable, Iterator, List, Optional, Tuple
 from dataclasses import dataclass
 from enum import Enum
 import random
 import base64
+import importlib.util
+import logging
 from pathlib import Path
 import time
-from PIL import Image
-from io import BytesIO
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
 from styles import StyleManager, ComponentStyles
+from cache import TTLCache
+from search_index import SEARCH_FIELDS, SearchIndexRegistry, scan_frame
+from sync import TicketSnapshot
+from replica import MIN_FTS_CHARS, ReplicaSync, SqliteReplica
+from change_feed import ChangeFeed, SupabaseChangeSource
+from health import HealthMonitor, ServiceUnavailable, is_network_error
+from loader import ConcurrentLoader
+from repository import PostgrestRepository
+from text_cleaning import CARD_TEXT_COLUMNS, card_text, clean_columns, escape_html, safe_notes
+from quality import ISSUE_LABELS, issue_columns, issue_counts, issue_labels, issue_values, ticket_issues
+import tracing
+
+
+logger = logging.getLogger(__name__)
+
+ICON_PATH = Path(__file__).parent / "icon.jpeg"
+
+
+@st.cache_resource
+def get_icon_base64() -> str:
+    """icon.jpeg en base64, leído una vez por proceso.
+
+    El fichero ya es JPEG: se codifica tal cual, sin decodificarlo ni
+    recomprimirlo con PIL en cada rerun.
+    """
+    return base64.b64encode(ICON_PATH.read_bytes()).decode()
 
 
 # Configuración
-icon_image = Image.open("icon.jpeg")
+icon_base64 = get_icon_base64()
 st.set_page_config(
     page_title="Soporte Oportunidades",
-    page_icon=icon_image,
+    # Como data URI Streamlit lo usa directamente, sin pasar por PIL
+    page_icon=f"data:image/jpeg;base64,{icon_base64}",
     layout="wide",
     initial_sidebar_state="expanded"
 )
 
 StyleManager.inject_all()
 
-# Convertir imagen a base64
-def get_image_base64(image_path):
-    img = Image.open(image_path)
-    buffered = BytesIO()
-    img.save(buffered, format="JPEG")
-    img_base64 = base64.b64encode(buffered.getvalue()).decode()
-    return img_base64
-
-icon_base64 = get_image_base64("icon.jpeg")
-
 # Session state
 if "search_filter" not in st.session_state:
     st.session_state.search_filter = ""
 if "last_update" not in st.session_state:
     st.session_state.last_update = time.time()
+if "pending_edits" not in st.session_state:
+    st.session_state.pending_edits = {}
+if "edit_errors" not in st.session_state:
+    st.session_state.edit_errors = {}
 
 
 # ============================================================================
@@ -94,7 +118,19 @@ class Priority(Enum):
         }
 
 
-@dataclass
+STATUS_VALUES = [s.value for s in Status]
+PRIORITY_VALUES = [p.value for p in Priority]
+TICKET_FIELDS = ["id", "ticket_number", "title", "description", "status", "priority", "notes", "created_at"]
+
+# Representación compacta: enums como categorías (códigos int8), fechas como
+# datetime64 y textos en buffers de Arrow cuando pyarrow está disponible
+STATUS_DTYPE = pd.CategoricalDtype(STATUS_VALUES)
+PRIORITY_DTYPE = pd.CategoricalDtype(PRIORITY_VALUES)
+TEXT_DTYPE = pd.StringDtype("pyarrow" if importlib.util.find_spec("pyarrow") else "python")
+DEFAULT_CREATED_AT = "2026-02-13"
+
+
+@dataclass(slots=True)
 class Ticket:
     id: int
     ticket_number: str
@@ -112,14 +148,14 @@ class Ticket:
         if not status or status is None:
             status = Status.NEW.value
         status = str(status).lower().strip()
-        if status not in [s.value for s in Status]:
+        if status not in STATUS_VALUES:
             status = Status.NEW.value
             
         priority = data.get("priority", Priority.MEDIUM.value)
         if not priority or priority is None:
             priority = Priority.MEDIUM.value
         priority = str(priority).strip()
-        if priority not in [p.value for p in Priority]:
+        if priority not in PRIORITY_VALUES:
             priority = Priority.MEDIUM.value
         
         return cls(
@@ -132,206 +168,802 @@ class Ticket:
             notes=str(data.get("notes", "") or "").strip(),
             created_at=str(data.get("created_at", "2026-02-13") or "2026-02-13").strip()
         )
+    
+    @classmethod
+    def from_row(cls, values: tuple) -> "Ticket":
+        """Vista de una fila ya normalizada, en el orden de TICKET_FIELDS"""
+        ticket_id, ticket_number, title, description, status, priority, notes, created_at = values
+        if isinstance(created_at, pd.Timestamp):
+            created_at = created_at.isoformat()
+        return cls(int(ticket_id), ticket_number, title, description,
+                   str(status), str(priority), notes, created_at)
+
+
+
+@dataclass(frozen=True)
+class TicketMetrics:
+    """Recuentos por (status, priority) de un conjunto de tickets"""
+    counts: Dict[Tuple[str, str], int]
+    
+    def total(self, status: Optional[str] = None, priority: Optional[str] = None) -> int:
+        return sum(
+            count for (s, p), count in self.counts.items()
+            if (status is None or s == status) and (priority is None or p == priority)
+        )
+    
+    @classmethod
+    def from_rows(cls, rows: Iterable[dict]) -> "TicketMetrics":
+        """Filas {status, priority, total}; valores inválidos cuentan como en Ticket.from_dict"""
+        counts: Dict[Tuple[str, str], int] = {}
+        for row in rows:
+            status = str(row.get("status") or "").lower().strip()
+            if status not in STATUS_VALUES:
+                status = Status.NEW.value
+            priority = str(row.get("priority") or "").strip()
+            if priority not in PRIORITY_VALUES:
+                priority = Priority.MEDIUM.value
+            key = (status, priority)
+            counts[key] = counts.get(key, 0) + int(row.get("total") or 0)
+        return cls(counts)
+    
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> "TicketMetrics":
+        """Recuentos de un DataFrame ya normalizado"""
+        if df.empty:
+            return cls({})
+        sizes = df.groupby(["status", "priority"], observed=True).size()
+        return cls({(str(s), str(p)): int(n) for (s, p), n in sizes.items()})
+
+def _text_column(df: pd.DataFrame, column: str, default: str) -> pd.Series:
+    """Texto limpio: nulos y vacíos pasan a default y se recortan espacios"""
+    if column not in df.columns:
+        return pd.Series(default, index=df.index, dtype=TEXT_DTYPE)
+    values = df[column].astype(TEXT_DTYPE).fillna("")
+    return values.mask(values == "", default).str.strip()
+
+
+@tracing.traced("normalize")
+def normalize_tickets(df: pd.DataFrame) -> pd.DataFrame:
+    """Aplica las validaciones de Ticket.from_dict a columnas enteras.
+
+    Se ejecuta una vez por descarga: el resultado tiene todas las columnas de
+    TICKET_FIELDS con valores válidos y tipos compactos (status y priority
+    categóricos, created_at datetime64 UTC), así que render no revalida fila
+    a fila y solo crea objetos Ticket (Ticket.from_row) para lo que muestra.
+    """
+    if df.empty:
+        return df
+    df = df.copy()
+    
+    status = _text_column(df, "status", Status.NEW.value).str.lower()
+    df["status"] = status.where(status.isin(STATUS_VALUES), Status.NEW.value).astype(STATUS_DTYPE)
+    
+    priority = _text_column(df, "priority", Priority.MEDIUM.value)
+    df["priority"] = priority.where(priority.isin(PRIORITY_VALUES), Priority.MEDIUM.value).astype(PRIORITY_DTYPE)
+    
+    ticket_number = _text_column(df, "ticket_number", "")
+    missing = ticket_number == ""
+    if missing.any():
+        generated = pd.Series(np.random.randint(1000, 10000, size=int(missing.sum())), index=ticket_number.index[missing])
+        ticket_number[missing] = "TKT-" + generated.astype(TEXT_DTYPE)
+    df["ticket_number"] = ticket_number
+    
+    df["title"] = _text_column(df, "title", "Sin título")
+    df["description"] = _text_column(df, "description", "")
+    df["notes"] = _text_column(df, "notes", "")
+    created_at = pd.to_datetime(_text_column(df, "created_at", DEFAULT_CREATED_AT),
+                                utc=True, errors="coerce", format="ISO8601")
+    df["created_at"] = created_at.fillna(pd.Timestamp(DEFAULT_CREATED_AT, tz="UTC"))
+    
+    # Textos de las tarjetas limpios y escapados, una vez por descarga
+    for column, values in clean_columns(df["title"], df["description"]).items():
+        df[column] = values.astype(TEXT_DTYPE)
+    
+    # Motivos de cuarentena (quality.ISSUE_*) y marca de ticket malformado
+    for column, values in issue_columns(df["title"], df["description"], df["notes"]).items():
+        df[column] = values
+    return df
 
 
 # ============================================================================
 # SERVICIO SUPABASE
 # ============================================================================
 
+TICKET_COLUMNS = "id, ticket_number, title, description, status, priority, notes, created_at"
+DEFAULT_PAGE_SIZE = 500
+CACHE_TTL_SECONDS = 60
+CACHE_MAX_ENTRIES = 32
+SYNC_COLUMNS = TICKET_COLUMNS + ", updated_at"
+SYNC_INTERVAL_SECONDS = 5
+REALTIME_RESYNC_SECONDS = 60
+REALTIME_POLL_SECONDS = 2
+REPLICA_PATH = Path(__file__).parent / ".cache" / "tickets_replica.sqlite3"
+METRICS_TTL_SECONDS = 10
+CARD_HTML_CACHE_SIZE = 5000
+LOADER_MAX_WORKERS = 8
+LOAD_DEADLINES = {"health": 3.0, "metrics": 5.0, "global_metrics": 5.0, "tickets": 15.0}
+
+
+def _filter_value(value: Optional[str]) -> Optional[str]:
+    """Normaliza un filtro: "Todos" y vacío equivalen a sin filtro"""
+    if not value or value == "Todos":
+        return None
+    return value
+
+
+def _row_matches(row: dict, key: Tuple[Optional[str], Optional[str], Optional[str]]) -> bool:
+    """Indica si una fila pertenece al resultado cacheado bajo key"""
+    status_filter, priority_filter, search_query = key
+    if status_filter and row.get("status") != status_filter:
+        return False
+    if priority_filter and row.get("priority") != priority_filter:
+        return False
+    if search_query:
+        return any(search_query in str(row.get(f) or "").lower() for f in SEARCH_FIELDS)
+    return True
+
+
+def get_setting(name: str, default=None):
+    """Lee una opción de st.secrets; sin secrets configurados devuelve default"""
+    try:
+        return st.secrets.get(name, default)
+    except Exception:
+        return default
+
+
+@st.cache_resource
+def get_http_client():
+    """Pool HTTP compartido por todas las sesiones (opciones HTTP_* en secrets)"""
+    # httpx se importa al crear el primer cliente, después de pintar la barra lateral
+    from transport import TransportConfig, create_http_client
+    return create_http_client(TransportConfig.from_settings(get_setting),
+                              event_hooks=tracing.httpx_event_hooks())
+
+
+@st.cache_resource
+def get_supabase_client(url: str, key: str):
+    """Cliente de Supabase por proyecto; si falla no se cachea y se reintenta"""
+    from supabase import create_client
+    from supabase.lib.client_options import SyncClientOptions
+    return create_client(url, key, options=SyncClientOptions(httpx_client=get_http_client()))
+
+
+def create_postgrest_repository(client) -> PostgrestRepository:
+    """Repositorio HTTP sobre un cliente de Supabase ya creado"""
+    return PostgrestRepository(client, get_setting, get_backend_features(),
+                               STATUS_VALUES, PRIORITY_VALUES)
+
+
+@st.cache_resource
+def get_ticket_repository():
+    """Acceso a la tabla según TICKETS_BACKEND: "postgrest" (por defecto) o "postgres".
+
+    "postgres" conecta directamente a DATABASE_URL (opciones PG_* en secrets);
+    psycopg se importa solo en ese caso. Si falla no se cachea y se reintenta.
+    """
+    if get_setting("TICKETS_BACKEND", "postgrest") == "postgres":
+        from postgres_repository import PostgresConfig, PostgresRepository
+        return PostgresRepository(st.secrets["DATABASE_URL"],
+                                  PostgresConfig.from_settings(get_setting), get_setting)
+    return create_postgrest_repository(
+        get_supabase_client(st.secrets["SUPABASE_URL"], st.secrets["SUPABASE_KEY"]))
+
+
+@st.cache_resource
+def get_ticket_cache() -> TTLCache:
+    """Caché de resultados compartida por todas las sesiones del proceso"""
+    return TTLCache(max_entries=CACHE_MAX_ENTRIES, ttl=CACHE_TTL_SECONDS)
+
+
+@st.cache_resource
+def get_metrics_cache() -> TTLCache:
+    """Recuentos de fetch_metrics por búsqueda, con TTL corto"""
+    return TTLCache(max_entries=CACHE_MAX_ENTRIES, ttl=METRICS_TTL_SECONDS)
+
+
+@st.cache_resource
+def get_backend_features() -> dict:
+    """Funciones opcionales del servidor que fallaron (nombre -> instante del fallo)"""
+    return {}
+
+
+@st.cache_resource
+def get_health_monitor() -> HealthMonitor:
+    """Estado de conexión compartido por todas las sesiones del proceso"""
+    return HealthMonitor()
+
+
+def _in_session(task):
+    """Asocia al hilo del pool el contexto de la sesión que encarga la tarea"""
+    from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+    ctx = get_script_run_ctx()
+    
+    def run():
+        thread = threading.current_thread()
+        add_script_run_ctx(thread, ctx)
+        try:
+            return task()
+        finally:
+            add_script_run_ctx(thread, None)
+    return run
+
+
+@st.cache_resource
+def get_loader() -> ConcurrentLoader:
+    """Pool de hilos compartido por todas las sesiones para la carga de cada rerun"""
+    executor = ThreadPoolExecutor(max_workers=LOADER_MAX_WORKERS, thread_name_prefix="loader")
+    return ConcurrentLoader(executor, wrap=_in_session)
+
+
+@st.cache_resource
+def get_card_html_cache() -> TTLCache:
+    """HTML de tarjetas ya renderizadas, compartido por todas las sesiones"""
+    return TTLCache(max_entries=CARD_HTML_CACHE_SIZE, ttl=None)
+
+
+@st.cache_resource
+def get_search_indexes() -> SearchIndexRegistry:
+    """Índices de búsqueda de los snapshots cacheados (uno por filtro)"""
+    return SearchIndexRegistry(max_entries=CACHE_MAX_ENTRIES)
+
+
+@st.cache_resource
+def get_trace_stats() -> tracing.TraceStats:
+    """Percentiles de las trazas del proceso; con TRACE_LOG se escriben en el log"""
+    if get_setting("TRACE_LOG", False):
+        tracing.enable_logging()
+    return tracing.TraceStats()
+
+
+@st.cache_resource
+def get_ticket_snapshot() -> TicketSnapshot:
+    """Snapshot local para TICKETS_SYNC_MODE "delta" o "realtime", uno por proceso"""
+    return TicketSnapshot()
+
+
+@st.cache_resource
+def get_replica() -> SqliteReplica:
+    """Réplica SQLite para TICKETS_SYNC_MODE "replica" (ruta en TICKETS_REPLICA_PATH)"""
+    return SqliteReplica(get_setting("TICKETS_REPLICA_PATH", REPLICA_PATH))
+
+
+@st.cache_resource
+def get_replica_sync() -> ReplicaSync:
+    """Hilo que mantiene la réplica al día, uno por proceso"""
+    interval = float(get_setting("TICKETS_SYNC_INTERVAL", SYNC_INTERVAL_SECONDS))
+    return ReplicaSync(lambda: SupabaseService().sync_snapshot(force=True), interval).start()
+
+
+@st.cache_resource
+def get_change_feed() -> ChangeFeed:
+    """Listener de cambios compartido por todas las sesiones del proceso"""
+    cache, indexes = get_ticket_cache(), get_search_indexes()
+    
+    def invalidate_derived():
+        cache.clear()
+        indexes.clear()
+    
+    source = SupabaseChangeSource(st.secrets["SUPABASE_URL"], st.secrets["SUPABASE_KEY"])
+    columns = [c.strip() for c in SYNC_COLUMNS.split(",")]
+    return ChangeFeed(get_ticket_snapshot(), source, columns, on_change=invalidate_derived,
+                      transform=normalize_tickets).start()
+
+
 class SupabaseService:
     _instance = None
-    _client = None
+    _repository = None
     
     def __new__(cls):
         if cls._instance is None:
             cls._instance = super().__new__(cls)
         return cls._instance
     
-    def _get_client(self):
-        if self._client is None:
+    def _get_repository(self):
+        """Repositorio para una petición; None si no se pudo crear o el circuito está abierto"""
+        health = get_health_monitor()
+        if not health.allow_request():
+            return None
+        repository = self._create_repository()
+        if repository is None:
+            health.record_failure(ConnectionError("No se pudo conectar"))
+        return repository
+    
+    def _create_repository(self):
+        if self._repository is None:
             try:
-                from supabase import create_client
-                self._client = create_client(
-                    st.secrets["SUPABASE_URL"],
-                    st.secrets["SUPABASE_KEY"]
-                )
+                self._repository = get_ticket_repository()
             except Exception as e:
+                logger.warning("No se pudo crear el repositorio de tickets: %s", e)
                 return None
-        return self._client
+        return self._repository
+    
+    def _get_cache(self) -> TTLCache:
+        return get_ticket_cache()
+    
+    def clear_cache(self):
+        """Descarta todos los resultados cacheados"""
+        self._get_cache().clear()
+        get_metrics_cache().clear()
+        get_search_indexes().clear()
+        get_ticket_snapshot().mark_stale()
+    
+    def uses_snapshot(self) -> bool:
+        """True en los modos que sirven lecturas desde el snapshot local"""
+        return get_setting("TICKETS_SYNC_MODE", "full") in ("delta", "realtime", "replica")
+    
+    def realtime_enabled(self) -> bool:
+        return get_setting("TICKETS_SYNC_MODE", "full") == "realtime"
+    
+    def replica_enabled(self) -> bool:
+        return get_setting("TICKETS_SYNC_MODE", "full") == "replica"
     
+    def _patch_cache(self, ticket_id: int, changes: dict):
+        """Aplica un cambio a las entradas cacheadas que afecta.
+
+        Las entradas que contienen la fila se parchean (o la pierden si deja de
+        cumplir el filtro). Las que no la contienen pero pasarían a incluirla se
+        invalidan, porque no se puede insertar la fila en su posición sin releer.
+        """
+        cache = self._get_cache()
+        indexes = get_search_indexes()
+        entries = cache.items()
+        
+        known_row = None
+        for _, df in entries:
+            if not df.empty:
+                match = df[df["id"] == ticket_id]
+                if not match.empty:
+                    known_row = {**match.iloc[0].to_dict(), **changes}
+                    break
+        
+        for key, df in entries:
+            positions = df.index[df["id"] == ticket_id] if not df.empty else []
+            if len(positions) == 0:
+                candidate = known_row or {**changes, "title": None, "ticket_number": None}
+                search_unknown = known_row is None and key[2]
+                if search_unknown or _row_matches(candidate, key):
+                    cache.pop(key)
+                    indexes.discard(key)
+                continue
+            if _row_matches(known_row, key):
+                patched = df.copy()
+                for column, value in changes.items():
+                    if column in patched.columns:
+                        patched.loc[positions, column] = value
+                cache.replace(key, patched)
+                indexes.update_row(key, df, patched, df.index.get_loc(positions[0]), known_row)
+            else:
+                cache.replace(key, df.drop(index=positions))
+                indexes.discard(key)
+    
+    @tracing.traced("health")
     def test_connection(self) -> Tuple[bool, str, Optional[int]]:
+        """Estado de conexión cacheado por proceso (ver health.HealthMonitor).
+
+        Solo sondea cada PROBE_INTERVAL_SECONDS, o según el backoff si falla,
+        y el recuento sale de lo ya descargado cuando se conoce.
+        """
+        health = get_health_monitor()
+        health.note_count(self.known_row_count())
+        status = health.check(self._probe)
+        if status.ok is None:
+            return False, status.message, None
+        return status.ok, status.message, status.count
+    
+    def _report_failure(self, error: Exception):
+        """Registra el error; solo los fallos de transporte cuentan para el circuito.
+
+        Un ticket inexistente, una fila rechazada o el propio circuito abierto
+        (ServiceUnavailable) no dicen nada de la red y no alargan el backoff.
+        """
+        tracing.count("errors")
+        if is_network_error(error):
+            logger.warning("Error de red: %s", error)
+            get_health_monitor().record_failure(error)
+        else:
+            logger.error("Error de datos o de esquema (%s): %s", type(error).__name__, error)
+    
+    def _probe(self) -> Optional[int]:
+        """Petición mínima de comprobación (ver repository.test_connection)"""
+        repository = self._create_repository()
+        if not repository:
+            raise ConnectionError("No se pudo conectar")
+        return repository.test_connection()
+    
+    def known_row_count(self) -> Optional[int]:
+        """Filas de la tabla según el snapshot o las métricas ya cacheadas"""
+        snapshot = get_ticket_snapshot()
+        if self.uses_snapshot() and snapshot.loaded:
+            return len(snapshot.frame)
+        metrics = get_metrics_cache().get(None)
+        if metrics is not None:
+            return metrics.total()
+        full = self._get_cache().get((None, None, None))
+        return len(full) if full is not None else None
+    
+    def _search_cached(self, base_key: tuple, base: pd.DataFrame, search_query: str) -> pd.DataFrame:
+        """Busca dentro de un snapshot ya cacheado sin ir a la red.
+
+        Mientras el índice en memoria se construye (p. ej. justo después de
+        cargar la réplica al arrancar) responde el FTS5 de la réplica o, sin
+        ella, un recorrido lineal.
+        """
+        index = get_search_indexes().get(base_key, base)
+        if index is not None:
+            return base.iloc[index.search(search_query)]
+        if self.replica_enabled() and len(search_query) >= MIN_FTS_CHARS:
+            try:
+                ids = get_replica().ids(base_key[0], base_key[1], search_query)
+                return base[base["id"].isin(ids)]
+            except Exception as e:
+                logger.warning("No se pudo consultar la réplica local: %s", e)
+        return base.iloc[scan_frame(base, search_query)]
+    
+    def _fetch_all(self, repository, status_filter: Optional[str], priority_filter: Optional[str],
+                   search_query: Optional[str], page_size: int,
+                   columns: str = TICKET_COLUMNS) -> pd.DataFrame:
+        """Descarga el resultado entero y lo normaliza una sola vez (propaga excepciones)"""
+        return normalize_tickets(repository.fetch_tickets(status_filter, priority_filter,
+                                                          search_query, page_size, columns))
+    
+    def sync_snapshot(self, force: bool = False) -> int:
+        """Actualiza el snapshot local pidiendo solo lo cambiado desde la marca de agua.
+
+        La primera vez (o sin marca de agua) descarga la tabla completa. Devuelve
+        el número de filas insertadas, modificadas o borradas; si hubo cambios
+        invalida los resultados cacheados que se derivan del snapshot.
+        En modo replica cada cambio se escribe también en la réplica SQLite y,
+        al arrancar el proceso, el snapshot se carga de ella sin ir a la red.
+        """
+        snapshot = get_ticket_snapshot()
+        replica = get_replica() if self.replica_enabled() else None
+        default_interval = REALTIME_RESYNC_SECONDS if self.realtime_enabled() else SYNC_INTERVAL_SECONDS
+        interval = float(get_setting("TICKETS_SYNC_INTERVAL", default_interval))
+        if not force and not snapshot.is_due(interval):
+            return 0
+        # Una sola sincronización por proceso; las demás sesiones usan el snapshot actual
+        if not snapshot.sync_lock.acquire(blocking=not snapshot.loaded):
+            return 0
+        try:
+            if not force and not snapshot.is_due(interval):
+                return 0
+            if replica is not None and not snapshot.loaded and self._restore_replica(snapshot, replica):
+                changed = max(len(snapshot.frame), 1)
+                self._get_cache().clear()
+                get_search_indexes().clear()
+                return changed
+            repository = self._get_repository()
+            if not repository:
+                return 0
+            if snapshot.watermark is None:
+                snapshot.load(self._fetch_all(repository, None, None, None,
+                                              DEFAULT_PAGE_SIZE, SYNC_COLUMNS))
+                changed = max(len(snapshot.frame), 1)
+                if replica is not None:
+                    replica.replace_all(snapshot.frame)
+            else:
+                changes = normalize_tickets(
+                    repository.fetch_changes(snapshot.watermark, DEFAULT_PAGE_SIZE, SYNC_COLUMNS))
+                changed = snapshot.merge(changes)
+                tombstones = repository.fetch_tombstones(snapshot.tombstone_watermark)
+                if not tombstones.empty:
+                    changed += snapshot.delete(tombstones["id"], tombstones["deleted_at"])
+                if replica is not None and changed:
+                    replica.upsert(changes)
+                    if not tombstones.empty:
+                        replica.delete(tombstones["id"])
+            snapshot.mark_synced()
+            if replica is not None:
+                replica.set_meta(watermark=snapshot.watermark,
+                                 tombstone_watermark=snapshot.tombstone_watermark,
+                                 synced_at_wall=snapshot.synced_at_wall)
+            get_health_monitor().record_success(len(snapshot.frame))
+        except Exception as e:
+            self._report_failure(e)
+            return 0
+        finally:
+            snapshot.sync_lock.release()
+        
+        if changed:
+            self._get_cache().clear()
+            get_search_indexes().clear()
+        return changed
+    
+    @tracing.traced("replica_load")
+    def _restore_replica(self, snapshot: TicketSnapshot, replica: SqliteReplica) -> bool:
+        """Carga el snapshot desde la réplica con sus marcas de agua; False si está vacía"""
         try:
-            client = self._get_client()
-            if not client:
-                return False, "No se pudo conectar", None
-            response = client.table("opportunities").select("count", count="exact").execute()
-            count = response.count if hasattr(response, 'count') else len(response.data)
-            return True, "Conexión exitosa", count
+            rows = replica.select_all()
+            if rows.empty:
+                return False
+            synced_at_wall = replica.meta("synced_at_wall")
+            snapshot.restore(normalize_tickets(rows), replica.meta("watermark"),
+                             replica.meta("tombstone_watermark"),
+                             float(synced_at_wall) if synced_at_wall else None)
+            return True
         except Exception as e:
-            return False, str(e), None
+            logger.warning("No se pudo leer la réplica local: %s", e)
+            return False
     
+    @tracing.traced("fetch_tickets")
     def fetch_tickets(self, status_filter: Optional[str] = None, 
                      priority_filter: Optional[str] = None,
-                     search_query: Optional[str] = None) -> pd.DataFrame:
+                     search_query: Optional[str] = None,
+                     page_size: int = DEFAULT_PAGE_SIZE) -> pd.DataFrame:
+        key = (
+            _filter_value(status_filter),
+            _filter_value(priority_filter),
+            search_query.strip().lower() if search_query and search_query.strip() else None
+        )
+        cache = self._get_cache()
+        if self.uses_snapshot():
+            return self._fetch_from_snapshot(key)
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+        if key[2] and get_setting("TICKETS_SEARCH_MODE", "ilike") != "fts":
+            base_key = (key[0], key[1], None)
+            base = cache.get(base_key)
+            if base is not None:
+                return self._search_cached(base_key, base, key[2])
+        
         try:
-            client = self._get_client()
-            if not client:
+            repository = self._get_repository()
+            if not repository:
                 return pd.DataFrame()
-            
-            query = client.table("opportunities").select(
-                "id, ticket_number, title, description, status, priority, notes, created_at"
-            )
-            
-            if status_filter and status_filter != "Todos":
-                query = query.eq("status", status_filter)
-            if priority_filter and priority_filter != "Todos":
-                query = query.eq("priority", priority_filter)
-            
-            response = query.execute()
-            
-            if response.data:
-                df = pd.DataFrame(response.data)
-                df.columns = df.columns.str.lower()
-                
-                if search_query:
-                    search_query = search_query.lower()
-                    df = df[
-                        df['title'].str.lower().str.contains(search_query, na=False) |
-                        df['ticket_number'].str.lower().str.contains(search_query, na=False)
-                    ]
-                
-                return df
-            return pd.DataFrame()
+            df = self._fetch_all(repository, key[0], key[1], key[2], page_size)
+            cache.put(key, df)
+            get_health_monitor().record_success(len(df) if key == (None, None, None) else None)
+            return df
         except Exception as e:
+            self._report_failure(e)
             return pd.DataFrame()
     
+    def _fetch_from_snapshot(self, key: tuple) -> pd.DataFrame:
+        """fetch_tickets en modo delta/realtime: sincroniza y filtra el snapshot local.
+
+        En modo realtime el change feed mantiene el snapshot y la sincronización
+        por deltas solo actúa como red de seguridad cada REALTIME_RESYNC_SECONDS.
+        En modo replica sincroniza un hilo aparte, así que las lecturas no
+        esperan a la red.
+        """
+        if not self.replica_enabled() or not get_ticket_snapshot().loaded:
+            self.sync_snapshot()
+        if self.realtime_enabled() and get_ticket_snapshot().loaded:
+            get_change_feed()
+        cache = self._get_cache()
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+        if self.replica_enabled() and get_ticket_snapshot().loaded:
+            get_replica_sync()
+        base_key = (key[0], key[1], None)
+        base = cache.get(base_key)
+        if base is None:
+            base = get_ticket_snapshot().select(key[0], key[1])
+            cache.put(base_key, base)
+        return self._search_cached(base_key, base, key[2]) if key[2] else base
+    
+    @tracing.traced("fetch_metrics")
+    def fetch_metrics(self, search_query: Optional[str] = None) -> Optional[TicketMetrics]:
+        """Recuentos status × priority sin descargar filas de tickets.
+
+        En modo delta/realtime se calculan sobre el snapshot local; si no, los
+        pide el repositorio (con PostgREST, la función ticket_counts de
+        sql/ticket_metrics.sql o recuentos HEAD si falta). Devuelve None si falla.
+        """
+        search = search_query.strip().lower() if search_query and search_query.strip() else None
+        if self.uses_snapshot():
+            return TicketMetrics.from_frame(self._fetch_from_snapshot((None, None, search)))
+        cache = get_metrics_cache()
+        cached = cache.get(search)
+        if cached is not None:
+            return cached
+        try:
+            repository = self._get_repository()
+            if not repository:
+                return None
+            metrics = TicketMetrics.from_rows(repository.fetch_metrics(search))
+            cache.put(search, metrics)
+            get_health_monitor().record_success(metrics.total() if search is None else None)
+            return metrics
+        except Exception as e:
+            self._report_failure(e)
+            return None
+    
+    @tracing.traced("update_ticket")
     def update_ticket(self, ticket_id: int, status: str, notes: str, 
-                     priority: Optional[str] = None) -> bool:
+                     priority: Optional[str] = None) -> Optional[dict]:
+        """Guarda un ticket aplicando el cambio en local antes de la respuesta.
+
+        El snapshot y la caché se parchean al momento; con la fila que devuelve
+        el servidor (return=representation) se corrigen los valores y, si la
+        escritura falla, se restauran los anteriores. Devuelve los valores
+        guardados o None si hubo error.
+        """
+        data = {"status": status, "notes": notes}
+        if priority:
+            data["priority"] = priority
+        previous = self._known_values(ticket_id, list(data))
+        self._apply_local_update(ticket_id, data)
         try:
-            client = self._get_client()
-            if not client:
-                return False
-            data = {"status": status, "notes": notes}
-            if priority:
-                data["priority"] = priority
-            client.table("opportunities").update(data).eq("id", ticket_id).execute()
-            return True
+            repository = self._get_repository()
+            if not repository:
+                raise ServiceUnavailable("No se pudo conectar")
+            row = repository.update_ticket(ticket_id, data)
+            if row is None:
+                raise LookupError("Ticket no encontrado")
+            saved = {k: getattr(Ticket.from_dict(row), k) for k in data}
+            updated_at = row.get("updated_at")
+            if saved != data:
+                self._apply_local_update(ticket_id, {**saved, "updated_at": updated_at} if updated_at else saved)
+            elif updated_at:
+                self._apply_updated_at(ticket_id, updated_at)
+            if updated_at:
+                saved["updated_at"] = updated_at
+            get_health_monitor().record_success()
+            return saved
         except Exception as e:
-            return False
+            if previous is not None:
+                self._apply_local_update(ticket_id, previous)
+            self._report_failure(e)
+            return None
+    
+    def _known_values(self, ticket_id: int, columns: List[str]) -> Optional[dict]:
+        """Valores actuales de columns para ticket_id según el snapshot o la caché"""
+        frames = [get_ticket_snapshot().frame] + [df for _, df in self._get_cache().items()]
+        for df in frames:
+            if df.empty:
+                continue
+            match = df[df["id"] == ticket_id]
+            if not match.empty:
+                row = match.iloc[0]
+                return {c: str(row[c]) for c in columns if c in row.index and pd.notna(row[c])}
+        return None
+    
+    def _apply_local_update(self, ticket_id: int, data: dict):
+        """Refleja un cambio ya guardado en el snapshot, la caché y las métricas"""
+        if "notes" in data:
+            # Las notas cuentan para la cuarentena: recalcula los motivos de la fila
+            known = self._known_values(ticket_id, ["title", "description"])
+            if known and len(known) == 2:
+                data = {**data, **issue_values(known["title"], known["description"], data["notes"])}
+        get_ticket_snapshot().patch(ticket_id, data)
+        if self.replica_enabled():
+            get_replica().patch(ticket_id, data)
+        self._patch_cache(ticket_id, data)
+        get_metrics_cache().clear()
+    
+    def _apply_updated_at(self, ticket_id: int, updated_at: str):
+        """Solo la marca de tiempo: la caché de listados no la guarda y las métricas no cambian"""
+        get_ticket_snapshot().patch(ticket_id, {"updated_at": updated_at})
+        if self.replica_enabled():
+            get_replica().patch(ticket_id, {"updated_at": updated_at})
+    
+    @tracing.traced("update_tickets")
+    def update_tickets(self, edits: Dict[int, dict]) -> Dict[int, Optional[str]]:
+        """Guarda varias ediciones en un único lote (sql/update_tickets.sql con PostgREST).
+
+        edits es {id: {"status", "priority", "notes"}} y todas las filas llevan
+        las mismas columnas. Solo se envían id y las columnas editadas, así
+        que el resto de la fila no se sobrescribe con la copia local. Si el
+        servidor rechaza el lote (una fila inválida aborta la sentencia
+        entera) o solo guarda parte, las demás filas se guardan una a una
+        para saber cuáles fallan. Con un error de red o el circuito abierto
+        se deja de enviar y las filas no guardadas siguen pendientes.
+        Devuelve {id: None} si se guardó o {id: mensaje de error}.
+        """
+        if not edits:
+            return {}
+        edits = {int(ticket_id): dict(changes) for ticket_id, changes in edits.items()}
+        repository = self._get_repository()
+        if not repository:
+            return {ticket_id: "No se pudo conectar" for ticket_id in edits}
+        
+        results: Dict[int, Optional[str]] = {}
+        pending: List[int] = []
+        rows = [{"id": ticket_id, **changes} for ticket_id, changes in edits.items()]
+        try:
+            saved = repository.update_tickets(rows)
+            for ticket_id in edits:
+                if ticket_id in saved:
+                    results[ticket_id] = None
+                else:
+                    pending.append(ticket_id)
+            get_health_monitor().record_success()
+        except Exception as e:
+            self._report_failure(e)
+            if is_network_error(e):
+                return {ticket_id: str(e) or "No se pudo conectar" for ticket_id in edits}
+            pending = list(edits)
+        
+        for position, ticket_id in enumerate(pending):
+            repository = self._get_repository()
+            try:
+                if not repository:
+                    raise ServiceUnavailable("No se pudo conectar")
+                row = repository.update_ticket(ticket_id, edits[ticket_id])
+                results[ticket_id] = None if row is not None else "Ticket no encontrado"
+            except Exception as e:
+                self._report_failure(e)
+                results[ticket_id] = getattr(e, "message", None) or str(e)
+                if isinstance(e, ServiceUnavailable) or is_network_error(e):
+                    for unsent in pending[position + 1:]:
+                        results[unsent] = results[ticket_id]
+                    break
+        
+        for ticket_id, error in results.items():
+            if error is None:
+                self._apply_local_update(ticket_id, edits[ticket_id])
+        return results
 
 
 # ============================================================================
 # COMPONENTES UI
 # ============================================================================
 
-def render_metrics(tickets_df: pd.DataFrame):
-    """Métricas minimalistas"""
-    if tickets_df.empty:
-        cols = st.columns(4)
-        metrics = [
-            ("Total", "0", "🎫"),
-            ("Nuevos", "0", "🆕"),
-            ("En progreso", "0", "⏳"),
-            ("Alta prioridad", "0", "⚡")
-        ]
-        for col, (title, value, icon) in zip(cols, metrics):
-            with col:
-                st.markdown(ComponentStyles.stat_card(title, value, icon), unsafe_allow_html=True)
-        return
+@tracing.traced("render_metrics")
+def render_metrics(metrics: Optional[TicketMetrics], global_metrics: Optional[TicketMetrics] = None,
+                   status_filter: Optional[str] = None, priority_filter: Optional[str] = None,
+                   quarantined: Optional[int] = None):
+    """Métricas minimalistas a partir de recuentos agregados.
+
+    metrics cubre la búsqueda actual y los filtros se aplican sobre sus
+    celdas; global_metrics (toda la tabla) se muestra al lado si hay filtros.
+    quarantined son los tickets malformados del resultado (None si no se sabe).
+    """
+    if metrics is None:
+        metrics = TicketMetrics({})
+    show_global = global_metrics is not None and (
+        global_metrics is not metrics or bool(status_filter or priority_filter)
+    )
+    
+    def count(source: TicketMetrics, status: Optional[str] = None, priority: Optional[str] = None,
+              apply_filters: bool = True) -> int:
+        if apply_filters:
+            if status and status_filter and status != status_filter:
+                return 0
+            if priority and priority_filter and priority != priority_filter:
+                return 0
+            status, priority = status or status_filter, priority or priority_filter
+        return source.total(status, priority)
     
-    total = len(tickets_df)
-    new_count = len(tickets_df[tickets_df["status"]=="new"])
-    in_progress = len(tickets_df[tickets_df["status"]=="in_progress"])
-    high_priority = len(tickets_df[tickets_df["priority"]=="High"])
-    
-    cols = st.columns(4)
-    metrics = [
-        ("Total", str(total), "🎫", f"{total} tickets"),
-        ("Nuevos", str(new_count), "🆕", f"{round(new_count/total*100)}%"),
-        ("En progreso", str(in_progress), "⏳", f"{round(in_progress/total*100)}%"),
-        ("Alta prioridad", str(high_priority), "⚡", f"{round(high_priority/total*100)}%")
+    total = count(metrics)
+    cards = [
+        ("Nuevos", "🆕", {"status": Status.NEW.value}),
+        ("En progreso", "⏳", {"status": Status.IN_PROGRESS.value}),
+        ("Alta prioridad", "⚡", {"priority": Priority.HIGH.value}),
     ]
     
-    for col, (title, value, icon, trend) in zip(cols, metrics):
+    total_trend = f"de {global_metrics.total()} en total" if show_global else f"{total} tickets"
+    metrics_row = [("Total", str(total), "🎫", total_trend)]
+    for title, icon, cell in cards:
+        value = count(metrics, **cell)
+        trend = [f"{round(value / total * 100)}%"] if total else []
+        if show_global:
+            trend.append(f"{count(global_metrics, apply_filters=False, **cell)} en total")
+        metrics_row.append((title, str(value), icon, " · ".join(trend)))
+    
+    if quarantined is not None:
+        trend = f"{round(quarantined / total * 100)}% del resultado" if total else ""
+        metrics_row.append(("En cuarentena", str(quarantined), "⚠️", trend))
+    
+    cols = st.columns(len(metrics_row))
+    for col, (title, value, icon, trend) in zip(cols, metrics_row):
         with col:
             st.markdown(ComponentStyles.stat_card(title, value, icon, trend), unsafe_allow_html=True)
 
 
-def escape_html(text: str) -> str:
-    """Escapa caracteres especiales HTML"""
-    if not text:
-        return ""
-    text = str(text)
-    replacements = {
-        "&": "&amp;",
-        "<": "&lt;",
-        ">": "&gt;",
-        '"': "&quot;",
-        "'": "&#39;"
-    }
-    for old, new in replacements.items():
-        text = text.replace(old, new)
-    return text
-
-
-def sanitize_text(text: str) -> str:
-    """Limpia texto malformado"""
-    if not text:
-        return ""
-    text = str(text).strip()
-    # Remover comillas al inicio/final
-    if (text.startswith('"') and text.endswith('"')) or (text.startswith("'") and text.endswith("'")):
-        text = text[1:-1]
-    # Remover HTML tags
-    import re
-    text = re.sub(r'<[^>]+>', '', text)
-    # Remover caracteres repetidos erráticos (aaaaaaa)
-    text = re.sub(r'([a-z])\1{4,}', r'\1', text)
-    return text.strip()
-
-
-def detect_malformed_ticket(ticket: Ticket) -> bool:
-    """Detecta si un ticket está malformado"""
-    # Título sin [IA] o muy corto
-    if not ticket.title.startswith("[IA]") or len(ticket.title) < 10:
-        return True
-    # Description muy corta o vacía
-    if len(ticket.description) < 5:
-        return True
-    # Notes vacías o solo un placeholder
-    if not ticket.notes or len(ticket.notes) < 5 or ticket.notes.lower() in ["sad", "n/a", "none"]:
-        return True
-    return False
-
+def ticket_card_html(ticket: Ticket, dirty: bool = False,
+                     text: Optional[Tuple[str, str, str]] = None,
+                     issues: Optional[int] = None) -> str:
+    """HTML de una tarjeta blindada contra datos corruptos.
 
-@st.fragment
-def render_ticket_card(ticket: Ticket):
-    """Renderiza una tarjeta blindada contra datos corruptos"""
-    
-    import re
-    
-    # 1. Limpieza de Título y Persona (Seguro para Registro 5)
-    if " - " in ticket.title:
-        parts = ticket.title.split(" - ")
-        display_title = parts[0].replace("[IA]", "").strip()
-        person = parts[1].strip()
-    else:
-        display_title = ticket.title.replace("[IA]", "").strip()
-        person = "Sin asignar"
-
-    # 2. Limpieza de descripción (Elimina el "aaaaaaaa" y HTML roto)
-    # Elimina repeticiones de caracteres (más de 4 iguales)
-    clean_desc = re.sub(r'(.)\1{4,}', '', ticket.description)
-    clean_desc = clean_desc.replace('"', '').replace('*', '').replace('<', '').replace('>', '').strip()
-    # Remover comillas al inicio
-    if clean_desc.startswith("'") or clean_desc.startswith('"'):
-        clean_desc = clean_desc[1:]
-    
-    # 3. Validación de Notas (Si es "sad" o basura, no mostrar error)
-    if ticket.notes and len(ticket.notes) > 5 and ticket.notes.lower() not in ["sad", "n/a", "none"]:
-        safe_notes = ticket.notes
-    else:
-        safe_notes = "Sin detalles adicionales"
+    text son los CARD_TEXT_COLUMNS de la fila (ya limpios y escapados) e
+    issues su columna quality_issues; sin ellos se calculan aquí con
+    text_cleaning.card_text y quality.ticket_issues.
+    """
+    title_html, person_html, desc_html = text or card_text(ticket.title, ticket.description)
 
     # Mapeo de estados
     badge_map = {
@@ -342,19 +974,25 @@ def render_ticket_card(ticket: Ticket):
     }
     status_text = Status.display_names().get(Status(ticket.status), "Nuevo")
     priority_class = Priority.css_class().get(Priority(ticket.priority), "medium")
+    dirty_html = '<span class="ticket-dirty">Sin guardar</span>' if dirty else ""
+    if issues is None:
+        issues = ticket_issues(ticket.title, ticket.description, ticket.notes)
+    warning_html = (f'<span class="ticket-warning" title="{escape_html("; ".join(issue_labels(issues)))}">⚠</span>'
+                    if issues else "")
+    card_class = "ticket-card" + (" ticket-card-warning" if issues else "") + (" ticket-card-dirty" if dirty else "")
 
     # Renderizado HTML (Mantenemos la lógica pero con datos limpios)
-    card_html = f"""
-    <div class="ticket-card">
+    return f"""
+    <div class="{card_class}">
         <div class="ticket-header">
-            <span class="ticket-id">#{ticket.ticket_number}</span>
+            <span class="ticket-id">{warning_html}#{ticket.ticket_number}{dirty_html}</span>
             <div class="ticket-menu" id="menu-{ticket.id}">
                 <span style="color: var(--text-tertiary);">⋯</span>
             </div>
         </div>
-        <div class="ticket-title">{escape_html(display_title)}</div>
-        <div class="ticket-person"><i class="far fa-user" style="font-size: 0.7rem;"></i> {escape_html(person)}</div>
-        <div class="ticket-description">"{escape_html(clean_desc[:90])}{'...' if len(clean_desc) > 90 else ''}"</div>
+        <div class="ticket-title">{title_html}</div>
+        <div class="ticket-person">{person_html}</div>
+        <div class="ticket-description">"{desc_html}"</div>
         <div class="ticket-footer">
             <span class="badge {badge_map.get(ticket.status, 'badge-new')}">{status_text}</span>
             <div class="priority-indicator">
@@ -364,55 +1002,178 @@ def render_ticket_card(ticket: Ticket):
         </div>
     </div>
     """
-    st.markdown(card_html, unsafe_allow_html=True)
+
+
+def cached_card_html(ticket: Ticket, dirty: bool = False, cache: Optional[TTLCache] = None,
+                     text: Optional[Tuple[str, str, str]] = None,
+                     issues: Optional[int] = None) -> str:
+    """ticket_card_html memorizado por (id, hash del contenido) entre reruns y sesiones.
+
+    Quien pinta muchas tarjetas debe pasar cache (get_card_html_cache()) una
+    sola vez: consultar st.cache_resource por tarjeta cuesta más que el HTML.
+    """
+    content = (ticket.ticket_number, ticket.title, ticket.description, ticket.status,
+               ticket.priority, ticket.notes, ticket.created_at, dirty)
+    key = (ticket.id, hash(content))
+    if cache is None:
+        cache = get_card_html_cache()
+    html = cache.get(key)
+    if html is None:
+        html = ticket_card_html(ticket, dirty, text, issues)
+        cache.put(key, html)
+    return html
+
+
+@st.fragment
+def render_ticket_card(ticket: Ticket, card_cache: Optional[TTLCache] = None,
+                       text: Optional[Tuple[str, str, str]] = None,
+                       issues: Optional[int] = None):
+    """Renderiza una tarjeta con su popover de edición"""
+    text = text or card_text(ticket.title, ticket.description)
+    
+    # Cambios en cola (edición por lotes) todavía sin guardar
+    pending = st.session_state.pending_edits.get(ticket.id)
+    edit_error = st.session_state.edit_errors.get(ticket.id)
+    
+    # La tarjeta se dibuja en un hueco para poder repintarla tras guardar
+    card_slot = st.empty()
+    card_slot.markdown(cached_card_html(ticket, bool(pending), card_cache, text, issues),
+                       unsafe_allow_html=True)
+    if edit_error:
+        st.markdown(f'<div class="ticket-edit-error">⚠ {escape_html(edit_error)}</div>', unsafe_allow_html=True)
     
     # Popover para edición
     with st.popover("Editar"):
         st.markdown(f"### {ticket.ticket_number}")
-        st.caption(escape_html(display_title))
-        
-        # Formulario de edición
-        status_label = Status.display_names().get(Status(ticket.status), "Nuevo")
-        priority_label = Priority.display_names().get(Priority(ticket.priority), "Media")
-        
-        new_status = st.selectbox(
-            "Estado",
-            list(Status.display_names().values()),
-            index=list(Status.display_names().values()).index(status_label),
-            key=f"status_{ticket.id}"
-        )
-        
-        new_priority = st.selectbox(
-            "Prioridad",
-            list(Priority.display_names().values()),
-            index=list(Priority.display_names().values()).index(priority_label),
-            key=f"priority_{ticket.id}"
-        )
-        
-        new_notes = st.text_area(
-            "Notas",
-            value=safe_notes,
-            placeholder="Añade notas internas...",
-            key=f"notes_{ticket.id}"
+        st.caption(text[0])
+        saved = render_edit_form(ticket, safe_notes(ticket.notes))
+        if saved:
+            # Sin recargar la app: se repinta solo esta tarjeta (las notas
+            # nuevas pueden cambiar los motivos de cuarentena: sin issues)
+            ticket.status = saved["status"]
+            ticket.priority = saved.get("priority", ticket.priority)
+            ticket.notes = saved["notes"]
+            card_slot.markdown(cached_card_html(ticket, cache=card_cache, text=text), unsafe_allow_html=True)
+
+
+def render_edit_form(ticket: Ticket, safe_notes: str, key_prefix: str = "") -> Optional[dict]:
+    """Formulario de estado, prioridad y notas; devuelve los valores guardados o None"""
+    # Parte de los cambios en cola si los hay
+    pending = st.session_state.pending_edits.get(ticket.id)
+    current = pending or {"status": ticket.status, "priority": ticket.priority, "notes": safe_notes}
+    status_label = Status.display_names().get(Status(current["status"]), "Nuevo")
+    priority_label = Priority.display_names().get(Priority(current["priority"]), "Media")
+    
+    new_status = st.selectbox(
+        "Estado",
+        list(Status.display_names().values()),
+        index=list(Status.display_names().values()).index(status_label),
+        key=f"{key_prefix}status_{ticket.id}"
+    )
+    
+    new_priority = st.selectbox(
+        "Prioridad",
+        list(Priority.display_names().values()),
+        index=list(Priority.display_names().values()).index(priority_label),
+        key=f"{key_prefix}priority_{ticket.id}"
+    )
+    
+    new_notes = st.text_area(
+        "Notas",
+        value=current["notes"],
+        placeholder="Añade notas internas...",
+        key=f"{key_prefix}notes_{ticket.id}"
+    )
+    
+    if st.session_state.get("batch_edit"):
+        if st.button("Añadir a pendientes", type="primary", key=f"{key_prefix}stage_{ticket.id}", use_container_width=True):
+            st.session_state.pending_edits[ticket.id] = {
+                "status": Status.from_display(new_status),
+                "priority": Priority.from_display(new_priority),
+                "notes": new_notes,
+            }
+            st.session_state.edit_errors.pop(ticket.id, None)
+            st.rerun()
+    elif st.button("Guardar cambios", type="primary", key=f"{key_prefix}save_{ticket.id}", use_container_width=True):
+        saved = SupabaseService().update_ticket(
+            ticket.id,
+            Status.from_display(new_status),
+            new_notes,
+            Priority.from_display(new_priority)
         )
-        
-        if st.button("Guardar cambios", type="primary", key=f"save_{ticket.id}", use_container_width=True):
-            supabase = SupabaseService()
-            if supabase.update_ticket(
-                ticket.id,
-                Status.from_display(new_status),
-                new_notes,
-                Priority.from_display(new_priority)
-            ):
-                st.success("✓ Actualizado")
-                time.sleep(0.5)
-                st.rerun()
-            else:
-                st.error("Error al guardar")
+        if saved:
+            st.success("✓ Actualizado")
+            return saved
+        st.error("Error al guardar")
+    return None
 
 
-def render_tickets_grid(tickets_df: pd.DataFrame):
-    """Renderiza el grid de tickets"""
+@tracing.traced("render_panel")
+def render_edit_panel(tickets_df: pd.DataFrame) -> bool:
+    """Un único formulario para el ticket seleccionado; True si se guardó un cambio"""
+    if tickets_df.empty:
+        return False
+    ids = tickets_df["id"].tolist()
+    numbers = dict(zip(ids, tickets_df["ticket_number"].tolist()))
+    ticket_id = st.selectbox(
+        "Editar ticket",
+        ids,
+        index=None,
+        format_func=lambda i: f"#{numbers[i]}",
+        placeholder="Selecciona un ticket para editarlo",
+        key="edit_ticket_id"
+    )
+    if ticket_id is None:
+        return False
+    
+    ticket, (title_html, _, _), _ = next(_card_rows(tickets_df[tickets_df["id"] == ticket_id]))
+    edit_error = st.session_state.edit_errors.get(ticket.id)
+    
+    with st.container(border=True):
+        st.caption(title_html)
+        if edit_error:
+            st.markdown(f'<div class="ticket-edit-error">⚠ {escape_html(edit_error)}</div>', unsafe_allow_html=True)
+        return render_edit_form(ticket, safe_notes(ticket.notes), key_prefix="panel_") is not None
+
+
+def render_pending_edits(supabase: SupabaseService):
+    """Cola de ediciones de la sesión con guardado en un solo lote"""
+    pending = st.session_state.pending_edits
+    st.caption(f"{len(pending)} cambios pendientes" if pending else "Sin cambios pendientes")
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        if st.button("Guardar todo", type="primary", disabled=not pending, use_container_width=True):
+            results = supabase.update_tickets(pending)
+            failed = {ticket_id: error for ticket_id, error in results.items() if error}
+            for ticket_id, error in results.items():
+                if not error:
+                    pending.pop(ticket_id, None)
+            st.session_state.edit_errors = failed
+            st.session_state.edit_summary = (len(results) - len(failed), len(failed))
+            st.rerun()
+    with col2:
+        if st.button("Descartar", disabled=not pending, use_container_width=True):
+            pending.clear()
+            st.session_state.edit_errors = {}
+            st.rerun()
+    
+    summary = st.session_state.pop("edit_summary", None)
+    if summary:
+        saved, failed = summary
+        if saved:
+            st.success(f"✓ {saved} guardados")
+        if failed:
+            st.error(f"{failed} no se pudieron guardar")
+
+
+@tracing.traced("render_grid")
+def render_tickets_grid(tickets_df: pd.DataFrame, view: str = "panel"):
+    """Renderiza el grid de tickets.
+
+    view "panel" pinta un solo bloque HTML y se edita con render_edit_panel;
+    "cards" crea una tarjeta con su popover de edición por ticket.
+    """
     if tickets_df.empty:
         st.markdown("""
         <div style="text-align: center; padding: 4rem; background: var(--bg-secondary); border-radius: 24px; border: 1px solid var(--border-medium);">
@@ -423,13 +1184,93 @@ def render_tickets_grid(tickets_df: pd.DataFrame):
         """, unsafe_allow_html=True)
         return
     
+    if view == "panel":
+        # Todo el grid en un solo elemento: el número de deltas no crece con los tickets
+        st.markdown(grid_html(tickets_df, st.session_state.pending_edits), unsafe_allow_html=True)
+        return
+    
     # Grid de 3 columnas
     cols = st.columns(3, gap="small")
     
-    for idx, (_, row) in enumerate(tickets_df.iterrows()):
-        ticket = Ticket.from_dict(row.to_dict())
+    card_cache = get_card_html_cache()
+    for idx, (ticket, text, issues) in enumerate(_card_rows(tickets_df)):
         with cols[idx % 3]:
-            render_ticket_card(ticket)
+            render_ticket_card(ticket, card_cache, text, issues)
+
+
+def _card_rows(tickets_df: pd.DataFrame) -> Iterator[Tuple[Ticket, Tuple[str, str, str], Optional[int]]]:
+    """(Ticket, textos HTML de la tarjeta, quality_issues) por fila.
+
+    Las filas llegan ya normalizadas (normalize_tickets) desde SupabaseService,
+    con los textos limpios y escapados en CARD_TEXT_COLUMNS y los motivos de
+    cuarentena en quality_issues, así que la tarjeta no vuelve a calcularlos.
+    """
+    split = len(TICKET_FIELDS)
+    columns = TICKET_FIELDS + CARD_TEXT_COLUMNS
+    has_issues = "quality_issues" in tickets_df.columns
+    if has_issues:
+        columns = columns + ["quality_issues"]
+    for values in tickets_df[columns].itertuples(index=False, name=None):
+        issues = int(values[-1]) if has_issues else None
+        yield Ticket.from_row(values[:split]), values[split:split + len(CARD_TEXT_COLUMNS)], issues
+
+
+def grid_html(tickets_df: pd.DataFrame, pending: Container[int] = ()) -> str:
+    """Todas las tarjetas en un único bloque HTML con grid CSS de 3 columnas"""
+    card_cache = get_card_html_cache()
+    cards = []
+    for ticket, text, issues in _card_rows(tickets_df):
+        cards.append(cached_card_html(ticket, ticket.id in pending, card_cache, text, issues).strip())
+    return '<div class="ticket-grid">\n' + "\n".join(cards) + "\n</div>"
+
+
+GRID_VIEWS = {"Panel de edición": "panel", "Editar en tarjeta": "cards"}
+# Filtro de cuarentena: valor de is_malformed a mostrar (None, todos)
+QUALITY_FILTERS = {"Todos": None, "Válidos": False, "En cuarentena": True}
+PAGE_SIZES = [30, 60, 120, 300]
+
+
+def filter_quality(tickets_df: pd.DataFrame, quarantine: Optional[bool]) -> pd.DataFrame:
+    """Solo los tickets en cuarentena (True), solo los válidos (False) o todos (None)"""
+    if quarantine is None or "is_malformed" not in tickets_df.columns:
+        return tickets_df
+    return tickets_df[tickets_df["is_malformed"] == quarantine]
+
+
+def _load_more(page_size: int):
+    """Callback de "Cargar más": amplía la ventana visible del grid"""
+    st.session_state.grid_limit += page_size
+
+
+def render_debug_panel(trace: tracing.Trace, stats: tracing.TraceStats):
+    """Fases del rerun, contadores de red y p50/p95 del proceso (DEBUG_PANEL)"""
+    summary = stats.summary()
+    rows = [
+        {
+            "Fase": name,
+            "ms": round(total * 1000, 1),
+            "Llamadas": calls,
+            "p50 ms": round(summary[name][1] * 1000, 1) if name in summary else None,
+            "p95 ms": round(summary[name][2] * 1000, 1) if name in summary else None,
+        }
+        for name, (total, calls) in sorted(trace.span_totals().items(), key=lambda item: -item[1][0])
+    ]
+    counters = trace.counters
+    st.markdown("### Depuración")
+    n, p50, p95 = summary.get("rerun", (0, 0.0, 0.0))
+    st.caption(f"Rerun {trace.wall * 1000:.0f} ms · p50 {p50 * 1000:.0f} ms · p95 {p95 * 1000:.0f} ms ({n} reruns)")
+    st.caption(f"{int(counters['http_requests'])} peticiones · {counters['http_bytes'] / 1024:.1f} KB · "
+               f"{int(counters['rows'])} filas · {int(counters['errors'])} errores")
+    st.dataframe(pd.DataFrame(rows), hide_index=True, use_container_width=True)
+
+
+@st.fragment(run_every=REALTIME_POLL_SECONDS)
+def watch_snapshot_version():
+    """Relanza la app cuando el change feed ha modificado el snapshot"""
+    version = get_ticket_snapshot().version
+    if st.session_state.get("snapshot_version", version) != version:
+        st.session_state.snapshot_version = version
+        st.rerun()
 
 
 # ============================================================================
@@ -437,6 +1278,21 @@ def render_tickets_grid(tickets_df: pd.DataFrame):
 # ============================================================================
 
 def main():
+    """Un rerun; con DEBUG_PANEL o TRACE_LOG se traza y se agrega por proceso"""
+    debug_panel = get_setting("DEBUG_PANEL", False)
+    enabled = debug_panel or get_setting("TRACE_LOG", False)
+    with tracing.trace(enabled) as trace:
+        render_app()
+    if trace is None:
+        return
+    stats = get_trace_stats()
+    stats.record(trace)
+    if debug_panel:
+        with st.sidebar:
+            render_debug_panel(trace, stats)
+
+
+def render_app():
     supabase = SupabaseService()
     
     # SIDEBAR
@@ -480,16 +1336,39 @@ def main():
             key="priority_filter"
         )
         
+        quality_filter = st.selectbox(
+            "Calidad de datos",
+            list(QUALITY_FILTERS),
+            key="quality_filter"
+        )
+        
+        grid_view = st.selectbox(
+            "Vista",
+            list(GRID_VIEWS),
+            key="grid_view"
+        )
+        
+        page_size = st.selectbox(
+            "Tickets por página",
+            PAGE_SIZES,
+            key="page_size"
+        )
+        
+        # Edición por lotes
+        batch_edit = st.toggle("Edición por lotes", key="batch_edit")
+        if batch_edit or st.session_state.pending_edits:
+            render_pending_edits(supabase)
+        
         # Botón actualizar
         if st.button("↻ Actualizar", use_container_width=True):
             st.cache_data.clear()
+            supabase.clear_cache()
             st.rerun()
         
         st.divider()
         
-        # Estado de conexión
-        success, _, count = supabase.test_connection()
-        st.markdown(ComponentStyles.connection_status(success, count or 0), unsafe_allow_html=True)
+        # Estado de conexión (se rellena tras la carga concurrente)
+        status_slot = st.container()
     
     # CONTENIDO PRINCIPAL
     st.markdown(ComponentStyles.page_header(
@@ -513,18 +1392,81 @@ def main():
     }
     
     # OBTENER TICKETS
-    with st.spinner("Cargando tickets..."):
-        tickets = supabase.fetch_tickets(
-            status_map[status_filter],
-            priority_map[priority_filter],
-            search if search else None
+    status_value = status_map[status_filter]
+    priority_value = priority_map[priority_filter]
+    search_value = search.strip() if search and search.strip() else None
+    with st.spinner("Cargando tickets..."), tracing.span("load"):
+        loaded = get_loader().load(
+            {
+                "health": supabase.test_connection,
+                "metrics": lambda: supabase.fetch_metrics(search_value),
+                "global_metrics": lambda: supabase.fetch_metrics() if search_value else None,
+                "tickets": lambda: supabase.fetch_tickets(status_value, priority_value, search_value),
+            },
+            deadlines=LOAD_DEADLINES,
+            defaults={
+                "health": (False, "Sin respuesta", None),
+                "tickets": pd.DataFrame(),
+            },
+            # Una descarga que agota su plazo sigue en el pool: los reruns y
+            # sesiones siguientes esperan a esa en vez de lanzar otra igual
+            keys={
+                "health": ("health",),
+                "metrics": ("metrics", search_value),
+                "global_metrics": ("metrics", None) if search_value else ("global_metrics",),
+                "tickets": ("tickets", status_value, priority_value, search_value),
+            },
         )
+        metrics = loaded["metrics"]
+        global_metrics = loaded["global_metrics"] if search_value else metrics
+        tickets = loaded["tickets"]
+        if supabase.uses_snapshot():
+            snapshot = get_ticket_snapshot()
+            st.session_state.last_update = snapshot.synced_at_wall
+            st.session_state.snapshot_version = snapshot.version
+    
+    with status_slot:
+        success, _, count = loaded["health"]
+        st.markdown(ComponentStyles.connection_status(success, count or 0), unsafe_allow_html=True)
+        health = get_health_monitor().status()
+        if health.circuit_open:
+            st.caption(f"Reintentando en {int(health.retry_in) + 1} s")
+        if supabase.realtime_enabled():
+            watch_snapshot_version()
+        if supabase.uses_snapshot() and st.session_state.last_update:
+            st.caption(f"Sincronizado {time.strftime('%H:%M:%S', time.localtime(st.session_state.last_update))}")
+        if get_setting("SHOW_LOAD_TIMINGS", False):
+            st.caption(f"Carga {loaded.wall * 1000:.0f} ms · en serie {loaded.sequential * 1000:.0f} ms")
+    
+    if "tickets" in loaded.timed_out:
+        st.warning("Los tickets están tardando en cargar; se mostrarán en la próxima actualización.")
+    
+    # CUARENTENA (máscara sobre is_malformed, sin recorrer filas en Python)
+    quarantine = QUALITY_FILTERS[quality_filter]
+    quarantined = None
+    if "is_malformed" in tickets.columns and "tickets" not in loaded.timed_out:
+        quarantined = int(tickets["is_malformed"].sum())
     
     # MÉTRICAS
-    render_metrics(tickets)
+    render_metrics(metrics, global_metrics, status_value, priority_value, quarantined)
+    
+    if quarantine and quarantined:
+        reasons = issue_counts(tickets["quality_issues"])
+        st.caption(" · ".join(f"{ISSUE_LABELS[bit]}: {n}" for bit, n in reasons.items() if n))
     
     st.divider()
     
+    tickets = filter_quality(tickets, quarantine)
+    
+    # VENTANA VISIBLE (se reinicia al cambiar filtros, búsqueda o tamaño de página)
+    window_key = (status_value, priority_value, search_value, quality_filter, page_size)
+    if st.session_state.get("grid_window_key") != window_key:
+        st.session_state.grid_window_key = window_key
+        st.session_state.grid_limit = page_size
+    limit = st.session_state.grid_limit
+    visible = tickets.head(limit)
+    shown = f"{len(visible)} de {len(tickets)} tickets" if len(tickets) > len(visible) else f"{len(tickets)} tickets"
+    
     # CONTADOR DE RESULTADOS
     if not tickets.empty:
         col1, col2 = st.columns([6, 1])
@@ -532,12 +1474,26 @@ def main():
             st.markdown(f"""
             <div style="display: flex; align-items: center; gap: 0.5rem; margin-bottom: 1rem;">
                 <span style="color: var(--text-secondary); font-size: 0.9rem;">Mostrando</span>
-                <span style="background: var(--bg-tertiary); color: var(--text-primary); padding: 0.2rem 0.8rem; border-radius: 20px; font-size: 0.8rem; font-weight: 600;">{len(tickets)} tickets</span>
+                <span style="background: var(--bg-tertiary); color: var(--text-primary); padding: 0.2rem 0.8rem; border-radius: 20px; font-size: 0.8rem; font-weight: 600;">{shown}</span>
             </div>
             """, unsafe_allow_html=True)
     
-    # GRID DE TICKETS
-    render_tickets_grid(tickets)
+    # GRID DE TICKETS (solo la ventana: fuera de ella no se crean widgets)
+    view = GRID_VIEWS[grid_view]
+    if view == "panel" and render_edit_panel(visible):
+        # La caché ya tiene el cambio aplicado: releerla no va a la red
+        tickets = filter_quality(supabase.fetch_tickets(status_value, priority_value, search_value), quarantine)
+        visible = tickets.head(limit)
+    render_tickets_grid(visible, view)
+    
+    remaining = len(tickets) - len(visible)
+    if remaining > 0:
+        st.button(
+            f"Cargar {min(page_size, remaining)} más",
+            on_click=_load_more,
+            args=(page_size,),
+            use_container_width=True
+        )
 
 
 if __name__ == "__main__":
@@ -0,0 +1,146 @@
+"""
+Snapshot local de opportunities sincronizado por deltas
+"""
+
+import threading
+import time
+from typing import Iterable, Optional
+
+import pandas as pd
+
+
+def _max_timestamp(values: pd.Series, current: Optional[str]) -> Optional[str]:
+    """Mayor marca temporal entre values y current, en ISO 8601 UTC"""
+    parsed = pd.to_datetime(values, utc=True, errors="coerce", format="ISO8601").dropna()
+    if parsed.empty:
+        return current
+    latest = parsed.max()
+    if current is not None:
+        latest = max(latest, pd.Timestamp(current))
+    return latest.isoformat()
+
+
+class TicketSnapshot:
+    """Copia en memoria de la tabla con marcas de agua del servidor.
+
+    watermark es el mayor updated_at recibido y tombstone_watermark el mayor
+    deleted_at de la tabla de borrados; ambas vienen del reloj de la base de
+    datos, así que no dependen del reloj de la máquina que ejecuta la app.
+    version aumenta con cada cambio aplicado para que las sesiones detecten
+    de forma barata si su vista quedó obsoleta.
+    """
+
+    def __init__(self):
+        self.frame = pd.DataFrame()
+        self.watermark: Optional[str] = None
+        self.tombstone_watermark: Optional[str] = None
+        self.version = 0
+        self.loaded = False
+        self.synced_at = 0.0
+        self.synced_at_wall: Optional[float] = None
+        self.sync_lock = threading.Lock()
+        self._lock = threading.RLock()
+
+    def is_due(self, interval: float) -> bool:
+        return not self.loaded or time.monotonic() - self.synced_at >= interval
+
+    def mark_synced(self):
+        self.synced_at = time.monotonic()
+        self.synced_at_wall = time.time()
+
+    def mark_stale(self):
+        self.synced_at = 0.0
+
+    def load(self, df: pd.DataFrame):
+        """Sustituye el contenido por una descarga completa"""
+        with self._lock:
+            self.frame = self._sorted(df)
+            if "updated_at" in df.columns:
+                self.watermark = _max_timestamp(df["updated_at"], None)
+            self.tombstone_watermark = self.watermark
+            self.loaded = True
+            self.version += 1
+
+    def restore(self, df: pd.DataFrame, watermark: Optional[str],
+                tombstone_watermark: Optional[str], synced_at_wall: Optional[float]):
+        """Carga una copia guardada (réplica local) con las marcas de agua que tenía"""
+        with self._lock:
+            self.load(df)
+            self.watermark = watermark
+            self.tombstone_watermark = tombstone_watermark
+            self.synced_at_wall = synced_at_wall
+
+    def merge(self, rows: pd.DataFrame) -> int:
+        """Inserta o reemplaza filas por id; devuelve cuántas se aplicaron"""
+        if rows.empty:
+            return 0
+        with self._lock:
+            rows = rows.drop_duplicates("id", keep="last")
+            if not self.frame.empty and "updated_at" in rows.columns and "updated_at" in self.frame.columns:
+                # Con gte la fila de la marca de agua vuelve en cada delta: no es un cambio
+                known = rows["id"].map(self.frame.set_index("id")["updated_at"])
+                rows = rows[known.isna() | (known != rows["updated_at"])]
+                if rows.empty:
+                    return 0
+            if self.frame.empty:
+                merged = rows
+            else:
+                kept = self.frame[~self.frame["id"].isin(rows["id"])]
+                merged = pd.concat([kept, rows], ignore_index=True)
+            self.frame = self._sorted(merged)
+            if "updated_at" in rows.columns:
+                self.watermark = _max_timestamp(rows["updated_at"], self.watermark)
+            self.version += 1
+            return len(rows)
+
+    def patch(self, ticket_id: int, changes: dict) -> bool:
+        """Aplica un cambio local conocido (p. ej. tras update_ticket)"""
+        with self._lock:
+            if self.frame.empty:
+                return False
+            positions = self.frame.index[self.frame["id"] == ticket_id]
+            if len(positions) == 0:
+                return False
+            patched = self.frame.copy()
+            for column, value in changes.items():
+                if column in patched.columns:
+                    patched.loc[positions, column] = value
+            self.frame = patched
+            self.version += 1
+            return True
+
+    def delete(self, ids: Iterable[int], deleted_at: Optional[pd.Series] = None) -> int:
+        """Aplica tombstones; devuelve cuántas filas desaparecieron"""
+        ids = list(ids)
+        with self._lock:
+            if deleted_at is not None:
+                self.tombstone_watermark = _max_timestamp(deleted_at, self.tombstone_watermark)
+            if self.frame.empty or not ids:
+                return 0
+            present = self.frame["id"].isin(ids)
+            removed = int(present.sum())
+            if removed:
+                self.frame = self.frame[~present].reset_index(drop=True)
+                self.version += 1
+            return removed
+
+    def select(self, status_filter: Optional[str] = None,
+               priority_filter: Optional[str] = None) -> pd.DataFrame:
+        """Filas que cumplen los filtros, en el orden de fetch_tickets"""
+        with self._lock:
+            df = self.frame
+        if df.empty:
+            return df
+        mask = pd.Series(True, index=df.index)
+        if status_filter:
+            mask &= df["status"] == status_filter
+        if priority_filter:
+            mask &= df["priority"] == priority_filter
+        return df if mask.all() else df[mask]
+
+    @staticmethod
+    def _sorted(df: pd.DataFrame) -> pd.DataFrame:
+        if df.empty or "created_at" not in df.columns:
+            return df.reset_index(drop=True)
+        return df.sort_values(["created_at", "id"], ascending=False,
+                              na_position="last", ignore_index=True)
@@ -0,0 +1,146 @@
+"""
+Limpieza del texto de los tickets para mostrarlos: patrones precompilados y
+una versión vectorizada (Series.str) que se aplica a columnas enteras una vez
+por descarga, en lugar de tarjeta a tarjeta en cada rerun
+"""
+
+import re
+from typing import Dict, Tuple
+
+import pandas as pd
+
+IA_TAG = "[IA]"
+PERSON_SEPARATOR = " - "
+NO_PERSON = "Sin asignar"
+NO_NOTES = "Sin detalles adicionales"
+PLACEHOLDER_NOTES = frozenset({"sad", "n/a", "none"})
+DESCRIPTION_PREVIEW_CHARS = 90
+
+# Repeticiones erráticas (aaaaaaa): usa referencias hacia atrás, que el motor
+# de Arrow no admite, así que también en columnas corre con el módulo re
+REPEATED_CHARS = re.compile(r"(.)\1{4,}")
+REPEATED_LETTERS = re.compile(r"([a-z])\1{4,}")
+HTML_TAGS = re.compile(r"<[^>]+>")
+# Los siguientes se pasan como texto a Series.str para que Arrow los ejecute en C
+DESCRIPTION_JUNK = re.compile(r'["*<>]')
+LEADING_QUOTE = re.compile(r"^'")
+WHITESPACE = re.compile(r"\s+")
+
+HTML_ESCAPES = (
+    ("&", "&amp;"),
+    ("<", "&lt;"),
+    (">", "&gt;"),
+    ('"', "&quot;"),
+    ("'", "&#39;"),
+)
+
+# Columnas que normalize_tickets añade a cada descarga (solo lo que se pinta)
+CARD_TEXT_COLUMNS = ["title_html", "person_html", "desc_html"]
+
+
+# ============================================================================
+# TEXTOS SUELTOS
+# ============================================================================
+
+def escape_html(text: str) -> str:
+    """Escapa caracteres especiales HTML"""
+    if not text:
+        return ""
+    text = str(text)
+    for old, new in HTML_ESCAPES:
+        if old in text:
+            text = text.replace(old, new)
+    return text
+
+
+def sanitize_text(text: str) -> str:
+    """Limpia texto malformado"""
+    if not text:
+        return ""
+    text = str(text).strip()
+    # Remover comillas al inicio/final
+    if (text.startswith('"') and text.endswith('"')) or (text.startswith("'") and text.endswith("'")):
+        text = text[1:-1]
+    text = HTML_TAGS.sub("", text)
+    text = REPEATED_LETTERS.sub(r"\1", text)
+    return text.strip()
+
+
+def _collapse(text: str) -> str:
+    # Sin saltos de línea: una línea en blanco cortaría el bloque HTML del grid
+    return WHITESPACE.sub(" ", text).strip()
+
+
+def clean_title(title: str) -> Tuple[str, str]:
+    """Título sin la marca [IA] y persona asignada ("Título - Persona")"""
+    parts = title.split(PERSON_SEPARATOR)
+    person = parts[1].strip() if len(parts) > 1 else NO_PERSON
+    return _collapse(parts[0].replace(IA_TAG, "")), _collapse(person)
+
+
+def clean_description(description: str) -> str:
+    """Descripción sin repeticiones erráticas, HTML roto ni comillas sueltas"""
+    text = REPEATED_CHARS.sub("", description)
+    text = LEADING_QUOTE.sub("", DESCRIPTION_JUNK.sub("", text).strip())
+    return _collapse(text)
+
+
+def safe_notes(notes: str) -> str:
+    """Notas para editar; los placeholders ("sad", "n/a"...) no se muestran"""
+    if notes and len(notes) > 5 and notes.lower() not in PLACEHOLDER_NOTES:
+        return notes
+    return NO_NOTES
+
+
+def _preview(description: str) -> str:
+    suffix = "..." if len(description) > DESCRIPTION_PREVIEW_CHARS else ""
+    return description[:DESCRIPTION_PREVIEW_CHARS] + suffix
+
+
+def card_text(title: str, description: str) -> Tuple[str, str, str]:
+    """Título, persona y extracto de descripción ya escapados para la tarjeta"""
+    display_title, person = clean_title(title)
+    return (escape_html(display_title), escape_html(person),
+            escape_html(_preview(clean_description(description))))
+
+
+# ============================================================================
+# COLUMNAS
+# ============================================================================
+
+def escape_html_column(values: pd.Series) -> pd.Series:
+    """escape_html sobre una columna; con Arrow cada pasada es vectorizada"""
+    for old, new in HTML_ESCAPES:
+        values = values.str.replace(old, new, regex=False)
+    return values
+
+
+def _collapse_column(values: pd.Series) -> pd.Series:
+    return values.str.replace(WHITESPACE.pattern, " ", regex=True).str.strip()
+
+
+def clean_columns(titles: pd.Series, descriptions: pd.Series) -> Dict[str, pd.Series]:
+    """CARD_TEXT_COLUMNS para columnas enteras.
+
+    Equivale a card_text fila a fila. Las versiones sin escapar son pasos
+    intermedios: guardarlas en el snapshot doblaría el texto por ticket.
+    Solo depende del título y la descripción, que las ediciones desde la
+    app no tocan, así que parchear estado, prioridad o notas no la invalida.
+    """
+    parts = titles.str.split(PERSON_SEPARATOR, n=2, expand=True).reindex(columns=[0, 1])
+    display_title = _collapse_column(parts[0].str.replace(IA_TAG, "", regex=False))
+    # Sin ningún separador en la columna, reindex la crea vacía (sin dtype de texto)
+    person = _collapse_column(parts[1].astype(titles.dtype).fillna(NO_PERSON))
+
+    desc = descriptions.str.replace(REPEATED_CHARS, "", regex=True)
+    desc = desc.str.replace(DESCRIPTION_JUNK.pattern, "", regex=True).str.strip()
+    clean_desc = _collapse_column(desc.str.replace(LEADING_QUOTE.pattern, "", regex=True))
+
+    preview = clean_desc.str.slice(0, DESCRIPTION_PREVIEW_CHARS)
+    preview = preview.mask(clean_desc.str.len() > DESCRIPTION_PREVIEW_CHARS, preview + "...")
+
+    return {
+        "title_html": escape_html_column(display_title),
+        "person_html": escape_html_column(person),
+        "desc_html": escape_html_column(preview),
+    }
@@ -0,0 +1,208 @@
+"""
+Trazas ligeras por rerun: spans con nombre, contadores por petición y
+agregados p50/p95 por proceso. Sin traza activa todo es un no-op.
+"""
+
+import contextvars
+import functools
+import json
+import math
+import logging
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from typing import Callable, Deque, Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+STATS_WINDOW = 200
+SUMMARY_EVERY = 50
+
+# Traza del rerun en curso; los hilos del loader la heredan con copy_context
+_current: contextvars.ContextVar[Optional["Trace"]] = contextvars.ContextVar("trace", default=None)
+
+
+class Trace:
+    """Spans y contadores de un rerun (varios hilos pueden escribir a la vez)"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.wall = 0.0
+        self.spans: Dict[str, List[float]] = defaultdict(list)
+        self.counters: Dict[str, float] = defaultdict(float)
+        self._lock = threading.Lock()
+
+    def add_span(self, name: str, seconds: float):
+        with self._lock:
+            self.spans[name].append(seconds)
+
+    def count(self, name: str, value: float = 1):
+        with self._lock:
+            self.counters[name] += value
+
+    def span_totals(self) -> Dict[str, Tuple[float, int]]:
+        """{nombre: (segundos sumados, llamadas)}"""
+        with self._lock:
+            return {name: (sum(times), len(times)) for name, times in self.spans.items()}
+
+    def as_dict(self) -> dict:
+        return {
+            "wall_ms": round(self.wall * 1000, 1),
+            "spans": {name: {"ms": round(total * 1000, 1), "calls": calls}
+                      for name, (total, calls) in self.span_totals().items()},
+            "counters": dict(self.counters),
+        }
+
+
+class _Span:
+    __slots__ = ("trace", "name", "started")
+
+    def __init__(self, trace: Trace, name: str):
+        self.trace = trace
+        self.name = name
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.trace.add_span(self.name, time.perf_counter() - self.started)
+        return False
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+def current() -> Optional[Trace]:
+    return _current.get()
+
+
+def span(name: str):
+    """Mide el bloque con nombre name en la traza activa (si la hay)"""
+    trace = _current.get()
+    return _Span(trace, name) if trace is not None else _NULL_SPAN
+
+
+def traced(name: str) -> Callable:
+    """Decorador equivalente a envolver la función en span(name)"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            trace = _current.get()
+            if trace is None:
+                return func(*args, **kwargs)
+            with _Span(trace, name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def count(name: str, value: float = 1):
+    """Suma value al contador name de la traza activa"""
+    trace = _current.get()
+    if trace is not None:
+        trace.count(name, value)
+
+
+@contextmanager
+def trace(enabled: bool = True) -> Iterator[Optional[Trace]]:
+    """Activa una traza nueva para el bloque; con enabled=False produce None"""
+    if not enabled:
+        yield None
+        return
+    active = Trace()
+    token = _current.set(active)
+    try:
+        yield active
+    finally:
+        active.wall = time.perf_counter() - active.started
+        _current.reset(token)
+
+
+# ============================================================================
+# HTTPX
+# ============================================================================
+
+def _on_request(request):
+    count("http_requests")
+
+
+def _on_response(response):
+    trace = _current.get()
+    if trace is not None:
+        response.read()
+        trace.count("http_bytes", response.num_bytes_downloaded)
+
+
+def httpx_event_hooks() -> Dict[str, List[Callable]]:
+    """Hooks de httpx que cuentan peticiones y bytes recibidos en la traza activa"""
+    return {"request": [_on_request], "response": [_on_response]}
+
+
+def enable_logging(level: int = logging.INFO):
+    """Escribe las líneas de traza en stderr aunque el logging raíz no esté configurado"""
+    if not logger.handlers:
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter("%(asctime)s %(name)s %(message)s"))
+        logger.addHandler(handler)
+        logger.propagate = False
+    logger.setLevel(level)
+
+
+# ============================================================================
+# AGREGADOS POR PROCESO
+# ============================================================================
+
+def _percentile(values: List[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[max(math.ceil(fraction * len(ordered)) - 1, 0)]
+
+
+class TraceStats:
+    """p50/p95 de cada span (sumado por rerun) sobre los últimos window reruns.
+
+    record escribe una línea JSON por rerun y, cada summary_every reruns,
+    otra con los percentiles.
+    """
+
+    def __init__(self, window: int = STATS_WINDOW, summary_every: int = SUMMARY_EVERY):
+        self.window = window
+        self.summary_every = summary_every
+        self.reruns = 0
+        self._samples: Dict[str, Deque[float]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, trace: Trace):
+        with self._lock:
+            self.reruns += 1
+            for name, (total, _) in trace.span_totals().items():
+                self._samples.setdefault(name, deque(maxlen=self.window)).append(total)
+            self._samples.setdefault("rerun", deque(maxlen=self.window)).append(trace.wall)
+            summarize = self.reruns % self.summary_every == 0
+        if not logger.isEnabledFor(logging.INFO):
+            return
+        logger.info("trace %s", json.dumps(trace.as_dict(), separators=(",", ":")))
+        if summarize:
+            logger.info("trace_summary %s", json.dumps(
+                {name: {"n": n, "p50_ms": round(p50 * 1000, 1), "p95_ms": round(p95 * 1000, 1)}
+                 for name, (n, p50, p95) in self.summary().items()},
+                separators=(",", ":"),
+            ))
+
+    def summary(self) -> Dict[str, Tuple[int, float, float]]:
+        """{nombre: (muestras, p50, p95)} en segundos"""
+        with self._lock:
+            samples = {name: list(values) for name, values in self._samples.items()}
+        return {name: (len(values), _percentile(values, 0.5), _percentile(values, 0.95))
+                for name, values in samples.items() if values}
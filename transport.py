@@ -0,0 +1,121 @@
+"""
+Transporte HTTP compartido con Supabase: pool keep-alive, timeouts explícitos
+y reintentos con backoff para las peticiones que se pueden repetir
+"""
+
+import dataclasses
+import importlib.util
+import logging
+import random
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+RETRY_STATUS_CODES = frozenset({502, 503, 504})
+# Errores en los que la petición no llegó al servidor: se pueden repetir siempre
+UNSENT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+# Errores a mitad de respuesta: solo se repiten las peticiones idempotentes
+READ_ERRORS = (httpx.ReadTimeout, httpx.ReadError, httpx.RemoteProtocolError)
+
+
+@dataclass(frozen=True)
+class TransportConfig:
+    connect_timeout: float = 3.0
+    read_timeout: float = 10.0
+    write_timeout: float = 10.0
+    pool_timeout: float = 5.0
+    max_connections: int = 20
+    max_keepalive: int = 10
+    keepalive_expiry: float = 30.0
+    retries: int = 2
+    backoff_base: float = 0.2
+    backoff_max: float = 2.0
+
+    @classmethod
+    def from_settings(cls, get_setting: Callable[[str, Any], Any]) -> "TransportConfig":
+        """Lee cada campo de la opción HTTP_<CAMPO> (p. ej. HTTP_READ_TIMEOUT)"""
+        values = {}
+        for f in dataclasses.fields(cls):
+            value = get_setting(f"HTTP_{f.name.upper()}", None)
+            if value is not None:
+                values[f.name] = type(f.default)(value)
+        return cls(**values)
+
+
+class RetryTransport(httpx.BaseTransport):
+    """Repite peticiones fallidas con backoff exponencial y jitter completo.
+
+    Los fallos de conexión se reintentan para cualquier método; los timeouts
+    de lectura y los 502/503/504 solo para métodos idempotentes, porque una
+    escritura pudo haberse aplicado aunque la respuesta no llegara.
+    """
+
+    def __init__(self, transport: httpx.BaseTransport, retries: int = 2,
+                 backoff_base: float = 0.2, backoff_max: float = 2.0):
+        self._transport = transport
+        self.retries = retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+    def _delay(self, attempt: int) -> float:
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        idempotent = request.method in IDEMPOTENT_METHODS
+        attempt = 0
+        while True:
+            try:
+                response = self._transport.handle_request(request)
+            except UNSENT_ERRORS as e:
+                if attempt >= self.retries:
+                    raise
+                reason = type(e).__name__
+            except READ_ERRORS as e:
+                if not idempotent or attempt >= self.retries:
+                    raise
+                reason = type(e).__name__
+            else:
+                if (response.status_code not in RETRY_STATUS_CODES
+                        or not idempotent or attempt >= self.retries):
+                    return response
+                response.close()
+                reason = f"HTTP {response.status_code}"
+            attempt += 1
+            delay = self._delay(attempt)
+            logger.info("Reintento %d de %s %s tras %s (espera %.2fs)",
+                        attempt, request.method, request.url.path, reason, delay)
+            time.sleep(delay)
+
+    def close(self):
+        self._transport.close()
+
+
+def create_http_client(config: TransportConfig,
+                       event_hooks: Optional[Dict[str, List[Callable]]] = None) -> httpx.Client:
+    """Cliente httpx con pool de conexiones reutilizables, pensado para compartirse"""
+    limits = httpx.Limits(
+        max_connections=config.max_connections,
+        max_keepalive_connections=config.max_keepalive,
+        keepalive_expiry=config.keepalive_expiry,
+    )
+    transport = httpx.HTTPTransport(
+        limits=limits,
+        http2=importlib.util.find_spec("h2") is not None,
+    )
+    return httpx.Client(
+        timeout=httpx.Timeout(
+            connect=config.connect_timeout,
+            read=config.read_timeout,
+            write=config.write_timeout,
+            pool=config.pool_timeout,
+        ),
+        transport=RetryTransport(transport, config.retries,
+                                 config.backoff_base, config.backoff_max),
+        event_hooks=event_hooks,
+        follow_redirects=True,
+    )